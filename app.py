@@ -1,47 +1,63 @@
-from flask import Flask, render_template, request, redirect, url_for, session
-import pandas as pd
+from flask import Flask, render_template, request, redirect, url_for, session, jsonify
+import numpy as np
+import openpyxl
 import math
 import json
 import os
+import hashlib
 import shutil
+import threading
 from io import BytesIO
 from datetime import datetime
+from trade_table import TradeTable
+from trade_store import StoredUpload, ParsedUploadCache, create_trade_store
+from lru import LRUCache
+from frame_archive import RetentionPolicy
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here'  # Change this to a random secret key
+app.config['FILTER_CACHE_SIZE'] = int(os.environ.get('FILTER_CACHE_SIZE', 64))
+app.config['TRADE_STORE_BACKEND'] = os.environ.get('TRADE_STORE_BACKEND', 'memory')  # 'disk' to share uploads between workers
+app.config['TRADE_STORE_MAX_BYTES'] = int(os.environ.get('TRADE_STORE_MAX_BYTES', 512 * 1024 * 1024))
+app.config['PARSED_CACHE_DIR'] = os.environ.get('PARSED_CACHE_DIR', os.path.join('cache', 'parsed'))
+app.config['PARSED_CACHE_MAX_BYTES'] = int(os.environ.get('PARSED_CACHE_MAX_BYTES', 2 * 1024 * 1024 * 1024))
 
-# Store data in a simple global variable (resets on server restart)
-trade_data_store = {
-    'all_trades': [],
-    'filtered_trades': [],
-    'trader_info': {}
-}
+# Parsed reports on disk keyed by content hash, so re-uploading a file skips parsing
+parsed_cache = ParsedUploadCache(app.config['PARSED_CACHE_DIR'], app.config['PARSED_CACHE_MAX_BYTES'])
+
+# Parsed uploads keyed by upload id (the content hash of the uploaded file).
+# Each session only keeps its upload id and filter choice.
+trade_store = create_trade_store(app.config, parsed_cache)
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 500
+SORT_KEYS = ('index', '-index', 'profit', '-profit', 'time', '-time', 'position', '-position')  # '-' for descending
+
+# Filter results keyed by (upload id, trade_type, filter_type)
+filter_cache = LRUCache(app.config['FILTER_CACHE_SIZE'])
+
+# Which filter the positions JSON on disk was written for, and the file's stat at that time
+positions_json_state = {'key': None, 'stat': None, 'writes': 0, 'writes_skipped': 0}
+positions_json_lock = threading.Lock()  # Held across check, write and record so requests can't interleave
 
 @app.route('/')
 def home():
-    # Get data from global store with pagination
-    trader_info = trade_data_store['trader_info']
-    
-    # Use filtered trades if available, otherwise show all trades
-    if session.get('filter_type') and 'filtered_trades' in trade_data_store and trade_data_store['filtered_trades']:
-        trades_to_display = trade_data_store['filtered_trades']
-    else:
-        # Show all trades by default
-        trades_to_display = trade_data_store['all_trades']
+    # Get this session's upload from the store with pagination
+    upload = current_upload()
+    trader_info = upload.trader_info
     
     page = request.args.get('page', 1, type=int)
-    per_page = 10
-    
-    # Calculate pagination
-    total = len(trades_to_display)
-    start = (page - 1) * per_page
-    end = start + per_page
-    trades_page = trades_to_display[start:end] if trades_to_display else []
+    per_page = clamp_page_size(request.args.get('per_page', DEFAULT_PAGE_SIZE, type=int))
+    sort = request.args.get('sort', 'index')
+    if sort not in SORT_KEYS:
+        sort = 'index'
+    search = request.args.get('search', '').strip()
+    if not search.isdigit():
+        search = ''
     
-    # Calculate pagination info
-    total_pages = math.ceil(total / per_page) if total > 0 else 1
-    has_prev = page > 1
-    has_next = page < total_pages
+    trades_page, pagination = paginate_trades(
+        upload, session.get('trade_type', 'all'), session.get('filter_type'), page, per_page, sort, search
+    )
     
     return render_template('index.html', 
                          title='Terminal | Trade Analyzer',
@@ -49,13 +65,30 @@ def home():
                          trades=trades_page,
                          trader_info=trader_info,
                          filtered_trades_count=session.get('filtered_trades_count'),
-                         pagination={
-                             'page': page,
-                             'total_pages': total_pages,
-                             'has_prev': has_prev,
-                             'has_next': has_next,
-                             'total_trades': total
-                         })
+                         pagination=pagination)
+
+@app.route('/api/trades')
+def api_trades():
+    """One page of the session's trades as JSON, for loading pages without a full reload"""
+    upload = current_upload()
+    trade_type = request.args.get('trade_type', session.get('trade_type', 'all'))
+    filter_type = request.args.get('filter_type', session.get('filter_type'))
+    sort = request.args.get('sort', 'index')
+    if sort not in SORT_KEYS:
+        return jsonify({'error': f"Unknown sort key: {sort}"}), 400
+    search = request.args.get('search', '').strip()
+    if search and not search.isdigit():
+        return jsonify({'error': "Position search only accepts digits"}), 400
+    
+    page = request.args.get('page', 1, type=int)
+    page_size = clamp_page_size(request.args.get('page_size', DEFAULT_PAGE_SIZE, type=int))
+    
+    trades_page, pagination = paginate_trades(upload, trade_type, filter_type, page, page_size, sort, search)
+    pagination['trades'] = trades_page
+    pagination['trade_type'] = trade_type
+    pagination['filter_type'] = filter_type
+    pagination['upload_trades'] = len(upload.table)
+    return jsonify(pagination)
 
 @app.route('/upload', methods=['POST'])
 def upload_file():
@@ -69,85 +102,36 @@ def upload_file():
     if file and file.filename.endswith('.xlsx'):
         try:
             # Read Excel file
-            file_content = BytesIO(file.read())
-            
-            # Suppress openpyxl warnings
-            import warnings
-            warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
-            
-            # Read the Excel file without header first to get raw data
-            df_raw = pd.read_excel(file_content, engine='openpyxl', header=None)
-            
-            # Extract trader info from specific rows based on the structure we found
-            trader_info = {}
-            
-            # Row 2 (index 1): Name is in column 4 (index 3)
-            if len(df_raw) > 1 and len(df_raw.columns) > 3:
-                name_value = df_raw.iloc[1, 3]  # Row 2, Column 4
-                if pd.notna(name_value):
-                    trader_info['name'] = str(name_value).strip()
+            file_bytes = file.read()
+            upload_id = hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
             
-            # Row 3 (index 2): Account is in column 4 (index 3)  
-            if len(df_raw) > 2 and len(df_raw.columns) > 3:
-                account_value = df_raw.iloc[2, 3]  # Row 3, Column 4
-                if pd.notna(account_value):
-                    trader_info['account'] = str(account_value).strip()
-            
-            # Reset file pointer for second read
-            file_content.seek(0)
-            
-            # Read the data starting from row 7 (index 6) which has the headers
-            df_trades = pd.read_excel(file_content, engine='openpyxl', header=6)
-            
-            all_trades = []
-            
-            # The profit column should be the last column (index 12, which is "Profit")
-            profit_col = 'Profit'
-            position_col = 'Position'
-            time_col = 'Time'
+            # Identical files are only parsed once
+            upload = trade_store.get(upload_id)
+            if upload is None and not trade_store.reads_parsed_cache:
+                upload = parsed_cache.load(upload_id)
+            if upload is None:
+                # Suppress openpyxl warnings
+                import warnings
+                warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
+                
+                # Single streaming pass over the workbook for trader info and trade rows
+                trader_info, trade_columns = read_trade_report(BytesIO(file_bytes))
+                
+                upload = StoredUpload(trader_info, TradeTable.from_columns(trade_columns))
+                parsed_cache.save(upload_id, upload)
             
-            # Check if columns exist and process all trades
-            if profit_col in df_trades.columns:
-                for index, row in df_trades.iterrows():
-                    try:
-                        profit = pd.to_numeric(row[profit_col], errors='coerce')
-                        if pd.notna(profit):  # Process all trades with valid profit values
-                            position = row[position_col] if position_col in df_trades.columns else 'N/A'
-                            time = row[time_col] if time_col in df_trades.columns else 'N/A'
-                            
-                            # Clean up the data
-                            position_str = str(position) if pd.notna(position) else 'N/A'
-                            time_str = str(time) if pd.notna(time) else 'N/A'
-                            
-                            # Determine trade type
-                            if profit > 0:
-                                trade_type = 'PROFIT'
-                            elif profit < 0:
-                                trade_type = 'LOSS'
-                            else:
-                                trade_type = 'BREAKEVEN'
-                            
-                            all_trades.append({
-                                'position': position_str,
-                                'time': time_str,
-                                'profit': float(profit),
-                                'type': trade_type,
-                                'original_index': index  # Store original index for consecutive detection
-                            })
-                    except (ValueError, TypeError):
-                        continue
+            all_trades = upload.table
             
-            # Store data in global store (no session size limits)
-            trade_data_store['all_trades'] = all_trades
-            trade_data_store['trader_info'] = trader_info
+            # Store data in the trade store under its content hash (no session size limits)
+            trade_store.put(upload_id, upload)
+            session['upload_id'] = upload_id
             
             # Clear any existing filters when new data is uploaded
             session.pop('trade_type', None)
             session.pop('filter_type', None)
             session.pop('filtered_trades_count', None)
-            trade_data_store['filtered_trades'] = []
             
-            if not all_trades:
+            if not len(all_trades):
                 session['error'] = "No trades found in the uploaded file"
             else:
                 session.pop('error', None)  # Clear any previous errors
@@ -168,43 +152,42 @@ def filter_trades():
     session['trade_type'] = trade_type
     session['filter_type'] = filter_type
     
-    # Get all trades from storage
-    all_trades = trade_data_store['all_trades']
-    
-    # First filter by trade type (profit/loss/all)
-    if trade_type == 'profit':
-        trades = [trade for trade in all_trades if trade['profit'] > 0]
-    elif trade_type == 'loss':
-        trades = [trade for trade in all_trades if trade['profit'] < 0]
-    else:  # 'all'
-        trades = all_trades
+    # Get all trades and their run index from storage
+    upload = current_upload()
+    all_trades = upload.table
     
-    if not trades:
+    if not upload.run_index.count(trade_type):
         session['filtered_trades_count'] = 0
-        trade_data_store['filtered_trades'] = []
         return redirect(url_for('home'))
     
-    # Apply consecutive filtering logic for any trade type
-    if filter_type != 'all':
-        filtered_trades = apply_consecutive_filter(trades, filter_type, trade_type)
-    else:
-        filtered_trades = trades
-    
-    # Store filtered results
-    trade_data_store['filtered_trades'] = filtered_trades
+    cache_key = (session.get('upload_id'), trade_type, filter_type)
+    filtered_trades = get_filtered_trades(upload, trade_type, filter_type)
     session['filtered_trades_count'] = len(filtered_trades)
     
-    # Save position values to JSON file
-    save_positions_to_json(filtered_trades)
+    # Save position values to JSON file, unless the file on disk already holds this filter
+    with positions_json_lock:
+        if positions_json_matches(cache_key):
+            positions_json_state['writes_skipped'] += 1
+        elif save_positions_to_json(all_trades.position_values(filtered_trades)):
+            remember_positions_json(cache_key)
     
     return redirect(url_for('home'))
 
+@app.route('/filter_cache_stats')
+def filter_cache_stats():
+    stats = filter_cache.stats()
+    with positions_json_lock:
+        stats['json_writes'] = positions_json_state['writes']
+        stats['json_writes_skipped'] = positions_json_state['writes_skipped']
+    stats['trade_store'] = trade_store.stats()
+    stats['parsed_cache'] = parsed_cache.stats()
+    return jsonify(stats)
+
 @app.route('/clear_filter')
 def clear_filter():
     session.pop('trade_type', None)
     session.pop('filter_type', None)
     session.pop('filtered_trades_count', None)
-    trade_data_store['filtered_trades'] = []
     
     # Clear the JSON file when filter is cleared
     clear_positions_json()
@@ -213,9 +196,8 @@ def clear_filter():
 
 @app.route('/clear')
 def clear_data():
-    trade_data_store['all_trades'] = []
-    trade_data_store['filtered_trades'] = []
-    trade_data_store['trader_info'] = {}
+    # The upload itself stays in the store for other sessions until it is evicted
+    session.pop('upload_id', None)
     session.pop('error', None)
     session.pop('trade_type', None)
     session.pop('filter_type', None)
@@ -230,10 +212,16 @@ def clear_data():
 def delete_files():
     """Delete all files in main/ and shots/ directories"""
     try:
-        directories_to_clear = ['main', 'shots']
-        deleted_files = []
+        # The frame archive writes shots/ flat, so its files go in one pass of the retention policy;
+        # only subdirectories someone else put there need removing by hand
+        deleted_files = RetentionPolicy(max_files=0).apply('shots')
+        if os.path.isdir('shots'):
+            for entry in os.scandir('shots'):
+                if entry.is_dir():
+                    shutil.rmtree(entry.path)
+                    deleted_files.append(f"{entry.path}/ (directory)")
         
-        for directory in directories_to_clear:
+        for directory in ['main']:
             if os.path.exists(directory):
                 # Get list of files before deletion for logging
                 files_in_dir = os.listdir(directory)
@@ -261,94 +249,176 @@ def delete_files():
     
     return redirect(url_for('home'))
 
-def apply_consecutive_filter(trades, filter_type, trade_type):
-    """Apply consecutive filtering logic based on filter type and trade type"""
-    
-    if filter_type == 'all':
-        return trades
-    
-    # Sort trades by original index to maintain order
-    sorted_trades = sorted(trades, key=lambda x: x.get('original_index', 0))
+def current_upload():
+    """The upload this session is working on, or an empty one"""
+    upload_id = session.get('upload_id')
+    upload = trade_store.get(upload_id)
+    if upload is None and upload_id is not None and not trade_store.reads_parsed_cache:
+        # Evicted from the store; reload it from the parsed cache if it is still there
+        upload = parsed_cache.load(upload_id)
+        if upload is not None:
+            trade_store.put(upload_id, upload)
+    if upload is None:
+        if upload_id is not None:
+            # Gone from both; the session has to upload the file again
+            session.pop('upload_id', None)
+            session['error'] = "Uploaded data expired, please upload the file again"
+        return StoredUpload.empty()
+    return upload
+
+def clamp_page_size(page_size):
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+def paginate_trades(upload, trade_type, filter_type, page, per_page, sort='index', search=''):
+    """
+    Rows and pagination info for one page of the active view.
+    Only the requested slice is materialized, so the cost doesn't grow with the report.
+    """
+    total, select_rows = resolve_view(upload, trade_type, filter_type, sort, search)
+    page = max(page, 1)
     
-    # Find consecutive groups based on trade type
-    consecutive_groups = find_consecutive_groups(sorted_trades, trade_type)
+    # Calculate pagination
+    total_pages = math.ceil(total / per_page) if total > 0 else 1
+    start = min((page - 1) * per_page, total)
+    end = min(start + per_page, total)
     
-    filtered_trades = []
+    return upload.table.rows(select_rows(start, end)), {
+        'page': page,
+        'per_page': per_page,
+        'total_pages': total_pages,
+        'has_prev': page > 1,
+        'has_next': page < total_pages,
+        'total_trades': total,
+        'sort': sort,
+        'search': search
+    }
+
+def resolve_view(upload, trade_type, filter_type, sort, search):
+    """
+    Size of the active view and a function returning the row indices at view positions
+    start:end. Unfiltered sorts and searches read straight from the upload's sort index;
+    filtered ones are materialized once and kept in the filter cache.
+    """
+    sort_index = upload.sort_index
+    key = sort.lstrip('-')
+    descending = sort.startswith('-')
     
-    if filter_type == 'consecutive':
-        # Return only trades that are part of consecutive sequences (2+ trades)
-        for group in consecutive_groups:
-            if len(group) >= 2:
-                filtered_trades.extend(group)
+    # Use filtered trades if available, otherwise show all trades
+    trades_to_display = None  # Show all trades by default
+    if filter_type:
+        filtered_trades = get_filtered_trades(upload, trade_type, filter_type)
+        if len(filtered_trades):
+            trades_to_display = filtered_trades
     
-    elif filter_type in ['1', '2', '3', '4', '5']:
-        max_count = int(filter_type)
+    if search:
+        # Search results are listed in position order
+        ranges = sort_index.position_prefix_ranges(search)
+        matches = sum(stop - start for start, stop in ranges)
+        if trades_to_display is None:
+            return matches, lambda start, end: sort_index.take_ranges(ranges, start, end)
+        view = get_cached_view(upload, trade_type, filter_type, ('search', search), lambda: keep_members(
+            sort_index.take_ranges(ranges, 0, matches), trades_to_display, len(upload.table)
+        ))
+    elif key == 'index':
+        total = len(trades_to_display) if trades_to_display is not None else len(upload.table)
         
-        for group in consecutive_groups:
-            if len(group) == 1:
-                # Single trade - include if max_count >= 1
-                if max_count >= 1:
-                    filtered_trades.extend(group)
+        def select_rows(start, end):
+            # Positions within the view for this page; '-index' walks the view backwards
+            if descending:
+                view_positions = np.arange(total - 1 - start, total - 1 - end, -1)
             else:
-                # Consecutive group - take up to max_count trades
-                filtered_trades.extend(group[:max_count])
+                view_positions = np.arange(start, end)
+            return trades_to_display[view_positions] if trades_to_display is not None else view_positions
+        
+        return total, select_rows
+    elif trades_to_display is None:
+        return len(upload.table), lambda start, end: sort_index.take(key, descending, np.arange(start, end))
+    else:
+        view = get_cached_view(upload, trade_type, filter_type, ('sort', sort), lambda: sort_index.ordered(
+            key, descending, member_mask(trades_to_display, len(upload.table))
+        ))
     
+    return len(view), lambda start, end: view[start:end]
+
+def member_mask(indices, size):
+    mask = np.zeros(size, dtype=bool)
+    mask[indices] = True
+    return mask
+
+def keep_members(rows, indices, size):
+    """rows that are also in indices, keeping the order of rows"""
+    return rows[member_mask(indices, size)[rows]]
+
+def get_cached_view(upload, trade_type, filter_type, view_key, build_view):
+    """A sorted or searched filtered view, memoized in the filter cache next to the filter itself"""
+    cache_key = (session.get('upload_id'), trade_type, filter_type, view_key)
+    view = filter_cache.get(cache_key)
+    if view is None:
+        view = build_view()
+        view.flags.writeable = False
+        filter_cache.put(cache_key, view)
+    return view
+
+def get_filtered_trades(upload, trade_type, filter_type):
+    """Filtered row indices for this session's upload, memoized in the filter cache"""
+    cache_key = (session.get('upload_id'), trade_type, filter_type)
+    filtered_trades = filter_cache.get(cache_key)
+    if filtered_trades is None:
+        # Trade type and consecutive filtering are both lookups in the precomputed run index
+        filtered_trades = upload.run_index.select(trade_type, filter_type)
+        filtered_trades.flags.writeable = False  # Shared by every later hit
+        filter_cache.put(cache_key, filtered_trades)
     return filtered_trades
 
-def find_consecutive_groups(sorted_trades, trade_type):
-    """Find groups of consecutive trades of the same type"""
-    if not sorted_trades:
-        return []
-    
-    groups = []
-    current_group = [sorted_trades[0]]
+def read_trade_report(file_content):
+    """
+    Read an MT5 history export in a single openpyxl read-only pass.
+    Returns the trader info from rows 2-3 and the raw original_index, position, time
+    and profit columns of the trade rows below the row 7 header.
+    """
+    trader_info = {}
+    trade_columns = {'original_index': [], 'position': [], 'time': [], 'profit': []}
     
-    for i in range(1, len(sorted_trades)):
-        current_trade = sorted_trades[i]
-        previous_trade = sorted_trades[i-1]
+    workbook = openpyxl.load_workbook(file_content, read_only=True, data_only=True)
+    try:
+        worksheet = workbook.worksheets[0]
+        worksheet.reset_dimensions()  # Read-only mode trusts the stored <dimension>, which can be stale; pandas resets it too
+        columns = {}
         
-        # Check if trades are consecutive and of the same type
-        if trades_are_consecutive(previous_trade, current_trade) and same_trade_type(previous_trade, current_trade, trade_type):
-            current_group.append(current_trade)
-        else:
-            groups.append(current_group)
-            current_group = [current_trade]
+        for row_number, row in enumerate(worksheet.iter_rows(values_only=True), start=1):
+            # Rows 2 and 3: Name and Account are in column 4
+            if row_number in (2, 3):
+                value = row[3] if len(row) > 3 else None
+                if value is not None:
+                    trader_info['name' if row_number == 2 else 'account'] = str(value).strip()
+            
+            # Row 7 holds the headers; keep the first column for each name
+            elif row_number == 7:
+                for col, header in enumerate(row):
+                    if header is not None:
+                        columns.setdefault(str(header).strip(), col)
+                if 'Profit' not in columns:
+                    break
+            
+            elif row_number > 7:
+                trade_columns['original_index'].append(row_number - 8)  # Same index pandas gives the data rows under header=6
+                trade_columns['position'].append(cell_value(row, columns.get('Position')))
+                trade_columns['time'].append(cell_value(row, columns.get('Time')))
+                trade_columns['profit'].append(cell_value(row, columns['Profit']))
+    finally:
+        workbook.close()
     
-    groups.append(current_group)
-    return groups
+    return trader_info, trade_columns
 
-def same_trade_type(trade1, trade2, trade_type):
-    """
-    Check if both trades are of the same type as specified
-    """
-    if trade_type == 'profit':
-        return trade1['profit'] > 0 and trade2['profit'] > 0
-    elif trade_type == 'loss':
-        return trade1['profit'] < 0 and trade2['profit'] < 0
-    else:  # 'all' - for mixed consecutive trades, we look for any consecutive pattern
-        return True
+def cell_value(row, col):
+    """Return the cell at col, treating missing columns and cells as empty"""
+    if col is None:
+        return 'N/A'
+    return row[col] if col < len(row) else None
 
-def save_positions_to_json(filtered_trades):
+def save_positions_to_json(positions):
     """Save position values from filtered trades to JSON file"""
     try:
-        # Extract only position values and convert to numbers (skip non-numeric)
-        positions = []
-        for trade in filtered_trades:
-            try:
-                # Try to convert position to integer/float
-                position_value = trade['position']
-                if position_value != 'N/A':
-                    # Try to convert to number
-                    numeric_position = float(position_value)
-                    # If it's a whole number, convert to int
-                    if numeric_position.is_integer():
-                        positions.append(int(numeric_position))
-                    else:
-                        positions.append(numeric_position)
-            except (ValueError, TypeError):
-                # Skip non-numeric positions
-                continue
-        
         # Create main folder if it doesn't exist
         main_folder = 'main'
         if not os.path.exists(main_folder):
@@ -374,9 +444,33 @@ def save_positions_to_json(filtered_trades):
             
         print(f"Saved {len(positions)} numeric positions to {positions_file_path}")
         print(f"Saved trade count to {count_file_path}")
+        return True
         
     except Exception as e:
         print(f"Error saving positions to JSON: {str(e)}")
+        return False
+
+def positions_json_stat():
+    """Modification time and size of the positions JSON file, None if it is missing"""
+    try:
+        stat = os.stat(os.path.join('main', 'filtered_positions.json'))
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+def remember_positions_json(cache_key):
+    """Record which filter the positions JSON file on disk was just written for"""
+    positions_json_state['key'] = cache_key
+    positions_json_state['stat'] = positions_json_stat()
+    positions_json_state['writes'] += 1
+
+def positions_json_matches(cache_key):
+    """Check the positions JSON file on disk was written for this filter and is untouched since"""
+    return (
+        positions_json_state['key'] == cache_key
+        and positions_json_state['stat'] is not None
+        and positions_json_state['stat'] == positions_json_stat()
+    )
 
 def clear_positions_json():
     """Clear/delete the positions JSON files"""
@@ -396,19 +490,5 @@ def clear_positions_json():
     except Exception as e:
         print(f"Error clearing JSON files: {str(e)}")
 
-def trades_are_consecutive(trade1, trade2):
-    """
-    Determine if two trades are consecutive based on original index.
-    Two trades are consecutive if they appear one after another in the original data.
-    """
-    try:
-        index1 = trade1.get('original_index', 0)
-        index2 = trade2.get('original_index', 0)
-        
-        # Check if the indices are consecutive
-        return index2 == index1 + 1
-    except (ValueError, TypeError):
-        return False
-
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,240 @@
+import argparse
+import glob
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from trade_table import TradeTable, RunIndex
+
+
+def make_trade_columns(rows, seed=0):
+    """Build synthetic report columns shaped like read_trade_report output"""
+    rng = np.random.default_rng(seed)
+    profit = np.round(rng.normal(0, 50, rows), 2).astype(object)
+    profit[rng.random(rows) < 0.01] = None  # Blank rows between report sections
+    start = np.datetime64('2024-01-01T00:00:00')
+    times = (start + np.arange(rows) * np.timedelta64(90, 's')).astype(str)
+
+    return {
+        'original_index': list(range(rows)),
+        'position': (10_000_000 + np.arange(rows)).tolist(),
+        'time': [t.replace('-', '.').replace('T', ' ') for t in times],
+        'profit': profit.tolist()
+    }
+
+
+def legacy_build_trades(trade_columns):
+    """The per-row iterrows loop upload_file used before the columnar trade table"""
+    df_trades = pd.DataFrame({
+        'Position': trade_columns['position'],
+        'Time': trade_columns['time'],
+        'Profit': trade_columns['profit']
+    })
+    all_trades = []
+
+    for index, row in df_trades.iterrows():
+        try:
+            profit = pd.to_numeric(row['Profit'], errors='coerce')
+            if pd.notna(profit):
+                position = row['Position']
+                time_value = row['Time']
+                position_str = str(position) if pd.notna(position) else 'N/A'
+                time_str = str(time_value) if pd.notna(time_value) else 'N/A'
+
+                if profit > 0:
+                    trade_type = 'PROFIT'
+                elif profit < 0:
+                    trade_type = 'LOSS'
+                else:
+                    trade_type = 'BREAKEVEN'
+
+                all_trades.append({
+                    'position': position_str,
+                    'time': time_str,
+                    'profit': float(profit),
+                    'type': trade_type,
+                    'original_index': index
+                })
+        except (ValueError, TypeError):
+            continue
+
+    return all_trades
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_build(sizes, skip_legacy_above):
+    print("📊 Trade classification: iterrows loop vs TradeTable.from_columns")
+    print(f"{'rows':>10} {'legacy (s)':>12} {'vectorized (s)':>16} {'speedup':>9}")
+
+    for rows in sizes:
+        trade_columns = make_trade_columns(rows)
+        vectorized, vectorized_time = timed(TradeTable.from_columns, trade_columns)
+
+        if rows > skip_legacy_above:
+            print(f"{rows:>10} {'skipped':>12} {vectorized_time:>16.3f} {'-':>9}")
+            continue
+
+        legacy, legacy_time = timed(legacy_build_trades, trade_columns)
+        assert len(legacy) == len(vectorized)
+        print(f"{rows:>10} {legacy_time:>12.3f} {vectorized_time:>16.3f} {legacy_time / vectorized_time:>8.1f}x")
+
+
+def bench_filter(sizes):
+    print("📊 Consecutive filtering: run index build once, then every trade type / filter lookup")
+    print(f"{'rows':>10} {'build (ms)':>12} {'combos':>8} {'total (ms)':>12} {'worst (ms)':>12}")
+
+    for rows in sizes:
+        table = TradeTable.from_columns(make_trade_columns(rows))
+        run_index, build_time = timed(RunIndex.build, table)
+        timings = []
+
+        for trade_type in ['all', 'profit', 'loss']:
+            for filter_type in ['all', '1', '2', '3', '4', '5', '10', '50', 'consecutive']:
+                _, elapsed = timed(run_index.select, trade_type, filter_type)
+                timings.append(elapsed * 1000)
+
+        print(f"{rows:>10} {build_time * 1000:>12.1f} {len(timings):>8} {sum(timings):>12.1f} {max(timings):>12.1f}")
+
+
+def bench_workflow(orders, targets, seed=0, batch=False, sweep=False):
+    """Run integrated_workflow end to end against the headless MT5 simulator"""
+    from script import IntegratedOrderProcessor
+    from screen_backend import SimulatorBackend
+
+    rng = np.random.default_rng(seed)
+    order_ids = np.sort(rng.choice(np.arange(100_000_000, 200_000_000), orders, replace=False)).tolist()
+    target_ids = sorted(rng.choice(order_ids, min(targets, orders), replace=False).tolist())
+
+    print(f"📊 Integrated workflow ({'batch' if batch else 'single'} delete{', sweep first' if sweep else ''}): "
+          f"{orders} orders in the list, {len(target_ids)} targets")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            os.makedirs('main')
+            with open(os.path.join('main', 'filtered_positions.json'), 'w') as json_file:
+                json.dump(target_ids, json_file)
+
+            backend = SimulatorBackend(order_ids)
+            processor = IntegratedOrderProcessor(backend=backend, batch_delete=batch, sweep_first=sweep)
+            _, wall_time = timed(processor.integrated_workflow)
+            processor.archive.close()  # Finish queued writes while the temporary directory exists
+        finally:
+            os.chdir(cwd)
+
+    processed = len(processor.processed_orders)
+    print(f"  processed: {processed}/{len(target_ids)}")
+    print(f"  wall time: {wall_time:.1f}s (OCR and image processing)")
+    print(f"  simulated terminal time: {backend.now():.1f}s (sleeps, pauses and input)")
+    print(f"  per processed order: {(wall_time + backend.now()) / max(processed, 1):.1f}s")
+    throughput = processor.throughput()
+    print(f"  throughput: {throughput['orders_per_minute']:.1f} orders/min of terminal time, "
+          f"{processed / (wall_time + backend.now()) * 60:.1f} orders/min overall, batches: {throughput['batch_sizes']}")
+    print(f"  screenshots: {backend.counts['screenshots']}, clicks: {backend.counts['clicks']}, keys: {backend.counts['keys']}")
+    ocr = processor.ocr_cache.stats()
+    print(f"  frames analyzed: {processor.frames_analyzed}, OCR cache hits: {ocr['hits']}/{ocr['hits'] + ocr['misses']}, "
+          f"OCR time {ocr['ocr_seconds']:.1f}s, saved {ocr['ocr_seconds_saved']:.1f}s")
+    navigation = processor.scroll.stats()
+    print(f"  frames per found order: {processor.frames_analyzed / max(processed, 1):.2f}, "
+          f"jumps: {navigation['jumps']}, jump keys: {navigation['keys']}")
+    if processor.sweep_stats:
+        print(f"  sweep: {processor.sweep_stats['indexed_orders']} orders indexed on {processor.sweep_stats['pages']} pages")
+    capture = processor.capture.stats()
+    print(f"  list captures: {capture['captures']}/{capture['checks']} ({capture['captures_skipped']} unchanged), "
+          f"own grabs: {capture['own_grabs']}, frames archived: {processor.archive.written}")
+    rows = processor.row_reader.stats()
+    print(f"  row strips read: {rows['strips_read']}/{rows['strips_seen']} ({rows['strip_reuse_rate']:.0%} reused), "
+          f"{rows['strips_tesseract']} by tesseract in {rows['tesseract_calls']} calls")
+    return processor, backend
+
+
+def load_fixture_frames(pattern, count):
+    """Captured list frames (click_and_screenshot's PNGs), or simulator renders when there are none"""
+    from PIL import Image
+
+    paths = sorted(glob.glob(pattern))[:count]
+    if paths:
+        return [Image.open(path).convert('RGB') for path in paths], pattern
+
+    from screen_backend import SimulatorBackend
+    backend = SimulatorBackend(range(100_000_000, 100_000_000 + count * 40))
+    frames = []
+    for _ in range(count):
+        frames.append(backend.screenshot(region=(627, 171, 147, 649)))
+        for _ in range(backend.visible_rows):
+            backend.press('up')
+    return frames, 'simulator renders'
+
+
+def bench_ocr(pattern, count):
+    """Time each available OCR engine on the same prepared list frames"""
+    import cv2
+    from ocr_engine import ENGINES
+    from order_ocr import DIGITS_CONFIG, FrameAnalysis, prepare_frame, selected_row_boxes
+
+    frames, source = load_fixture_frames(pattern, count)
+    prepared = []
+    for frame in frames:
+        img = cv2.cvtColor(np.array(frame), cv2.COLOR_RGB2BGR)
+        boxes = selected_row_boxes(img)
+        prepared.append((prepare_frame(img, boxes), boxes))
+
+    print(f"📊 OCR engines on {len(frames)} frames ({source})")
+    print(f"{'engine':>12} {'first_ms':>10} {'mean_ms':>10} {'ids':>6} {'agree':>8}")
+    reference = None
+    for name, engine_class in ENGINES.items():
+        try:
+            engine = engine_class()
+            reads, timings = [], []
+            for image, boxes in prepared:
+                data, elapsed = timed(engine.image_to_data, image, DIGITS_CONFIG)
+                reads.append(FrameAnalysis.from_ocr_data(data, boxes).order_ids())
+                timings.append(elapsed * 1000)
+        except Exception as e:
+            print(f"{name:>12} unavailable: {e}")
+            continue
+
+        reference = reference if reference is not None else reads
+        agree = sum(read == expected for read, expected in zip(reads, reference))
+        # The first call includes loading the model, which tesserocr then keeps
+        mean = np.mean(timings[1:]) if len(timings) > 1 else timings[0]
+        print(f"{name:>12} {timings[0]:>10.1f} {mean:>10.1f} {sum(map(len, reads)):>6} {agree:>5}/{len(reads)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Trade Analyzer benchmarks')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--skip-legacy-above', type=int, default=1_000_000,
+                        help='Skip the slow legacy implementation above this many rows')
+    parser.add_argument('--only', choices=['build', 'filter', 'workflow', 'ocr'], help='Run a single benchmark')
+    parser.add_argument('--orders', type=int, default=300, help='Orders in the simulated MT5 list')
+    parser.add_argument('--targets', type=int, default=20, help='Orders the simulated workflow has to delete')
+    parser.add_argument('--batch', action='store_true', help='Delete all targets in view at once in the workflow benchmark')
+    parser.add_argument('--sweep', action='store_true', help='Index the whole list before deleting in the workflow benchmark')
+    parser.add_argument('--frames', default=os.path.join('shots', 'integrated_orders_*.png'),
+                        help='Captured list frames for the OCR engine benchmark')
+    parser.add_argument('--frame-count', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.only in (None, 'build'):
+        bench_build(args.sizes, args.skip_legacy_above)
+    if args.only in (None, 'filter'):
+        bench_filter(args.sizes)
+    if args.only == 'workflow':
+        # Needs tesseract, so only run on request
+        bench_workflow(args.orders, args.targets, batch=args.batch, sweep=args.sweep)
+    if args.only == 'ocr':
+        bench_ocr(args.frames, args.frame_count)
+
+
+if __name__ == '__main__':
+    main()
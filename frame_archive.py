@@ -0,0 +1,146 @@
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+from PIL import features
+
+EXTENSIONS = {'png': '.png', 'webp': '.webp', 'raw': '.npy'}
+
+
+class RetentionPolicy:
+    """
+    Bounds a folder of archived frames by file count and/or total bytes, removing the
+    oldest files first. None means no limit; 0 empties the folder.
+    """
+
+    def __init__(self, max_files=None, max_bytes=None):
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+
+    @property
+    def bounded(self):
+        return self.max_files is not None or self.max_bytes is not None
+
+    def apply(self, folder, keep=None):
+        """Delete the oldest files, never keep, until folder is within the limits; returns the removed paths"""
+        if not self.bounded or not os.path.isdir(folder):
+            return []
+
+        entries = []
+        for entry in os.scandir(folder):
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+        entries.sort()
+
+        count = len(entries)
+        total = sum(size for _, _, size in entries)
+        removed = []
+        for _, path, size in entries:
+            if path == keep:
+                continue
+            if (self.max_files is None or count <= self.max_files) and (self.max_bytes is None or total <= self.max_bytes):
+                break
+            os.remove(path)
+            count -= 1
+            total -= size
+            removed.append(path)
+        return removed
+
+
+class FrameArchive:
+    """
+    Writes frames to disk on a background thread, so encoding and file I/O never hold
+    up the click loop. The queue is bounded: when the writer falls behind, new frames
+    are dropped and counted rather than waited for. Frames are stored as PNG at the
+    given compression level, lossless WebP, or raw pixel arrays (.npy), and the
+    retention policy runs after every write.
+    """
+
+    def __init__(self, folder='shots', encoding='png', compress_level=1, retention=None, queue_size=32):
+        if encoding not in EXTENSIONS:
+            raise ValueError(f"Unknown frame encoding {encoding!r}; expected one of {sorted(EXTENSIONS)}")
+        if encoding == 'webp' and not features.check('webp'):
+            raise ValueError("This Pillow build has no WebP support")
+
+        self.folder = os.path.abspath(folder)  # The writer thread must not depend on later chdirs
+        self.encoding = encoding
+        self.compress_level = compress_level   # PNG only: 0 (fastest) to 9 (smallest)
+        self.retention = retention if retention is not None else RetentionPolicy()
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = None
+        self.submitted = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.bytes_written = 0
+        self.removed = 0
+        self.write_seconds = 0.0
+
+    def submit(self, frame, name):
+        """Queue a frame to be written as folder/name; returns the path, or None if the queue was full"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name='frame-archive', daemon=True)
+            self.thread.start()
+
+        path = os.path.join(self.folder, name + EXTENSIONS[self.encoding])
+        try:
+            self.queue.put_nowait((frame, path))
+        except queue.Full:
+            self.dropped += 1
+            return None
+        self.submitted += 1
+        return path
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            finally:
+                self.queue.task_done()
+
+    def _write(self, frame, path):
+        start = time.perf_counter()
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            if self.encoding == 'png':
+                frame.save(path, compress_level=self.compress_level)
+            elif self.encoding == 'webp':
+                frame.save(path, lossless=True)  # Frames double as OCR fixtures, so keep every pixel
+            else:
+                np.save(path, np.asarray(frame))
+            self.bytes_written += os.path.getsize(path)
+            self.written += 1
+            self.removed += len(self.retention.apply(self.folder, keep=path))
+        except Exception as e:
+            self.failed += 1
+            print(f"⚠️ Could not archive {path}: {e}")
+        self.write_seconds += time.perf_counter() - start
+
+    def flush(self):
+        """Block until every queued frame is on disk"""
+        if self.thread is not None:
+            self.queue.join()
+
+    def close(self):
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def stats(self):
+        return {
+            'encoding': self.encoding,
+            'submitted': self.submitted,
+            'dropped': self.dropped,
+            'disk_writes': self.written,
+            'failed': self.failed,
+            'bytes_written': self.bytes_written,
+            'removed_by_retention': self.removed,
+            'write_seconds': round(self.write_seconds, 3)
+        }
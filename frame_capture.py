@@ -0,0 +1,63 @@
+from datetime import datetime
+
+from frame_archive import FrameArchive
+from order_ocr import frame_digest
+
+
+class FrameCapture:
+    """
+    Captures of the order list that reuse the image the UI wait already grabbed once
+    the list settled, so a capture needs no grab of its own. When that image matches
+    the last frame pixel for pixel, the last frame object is returned again, so the
+    frame memo in front of OCR skips the read too. Frames are handed to the archive
+    only with save_frames on, or when a caller saves one after a failure.
+    """
+
+    def __init__(self, backend, region, archive=None, save_frames=False, prefix='integrated_orders'):
+        self.backend = backend
+        self.region = region
+        self.archive = archive if archive is not None else FrameArchive()
+        self.save_frames = save_frames
+        self.prefix = prefix
+        self.frame = None
+        self.frame_digest = None      # Hash of self.frame's pixels
+        self.last_path = None         # Where self.frame is archived, if it is
+        self.checks = 0
+        self.captures = 0
+        self.grabs = 0
+        self.saves = 0
+
+    def capture(self, image=None, force=False):
+        """(frame, fresh): image (a new grab of the region if None), or the last frame when the pixels match"""
+        if image is None:
+            image = self.backend.screenshot(region=self.region)
+            self.grabs += 1
+        digest = frame_digest(image)
+        self.checks += 1
+        if not force and self.frame is not None and digest == self.frame_digest:
+            return self.frame, False
+
+        self.frame = image
+        self.frame_digest = digest
+        self.captures += 1
+        self.last_path = self.save(self.frame) if self.save_frames else None
+        return self.frame, True
+
+    def save(self, frame=None, reason=None):
+        """Queue a frame (the last one by default) for the archive; returns its path, None if dropped"""
+        frame = frame if frame is not None else self.frame
+        if frame is None:
+            return None
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        suffix = f"_{reason}" if reason else ''
+        self.saves += 1
+        return self.archive.submit(frame, f"{self.prefix}_{timestamp}_{self.saves:04d}{suffix}")
+
+    def stats(self):
+        return {
+            'checks': self.checks,
+            'captures': self.captures,
+            'captures_skipped': self.checks - self.captures,
+            'own_grabs': self.grabs,
+            'frames_saved': self.saves
+        }
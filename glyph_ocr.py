@@ -0,0 +1,158 @@
+import cv2
+import numpy as np
+
+GLYPH_SIZE = (12, 16)      # Width, height every glyph is resampled to before matching
+MATCH_SCORE = 0.90         # Minimum correlation for a glyph to count as read
+MATCH_MARGIN = 0.05        # Required lead over the best template of any other digit
+LEARN_CONFIDENCE = 90.0    # Tesseract word confidence needed before its glyphs are learned
+TEMPLATES_PER_DIGIT = 8
+
+
+def ink_mask(gray):
+    """Dark-on-light strip to a boolean ink mask; blank strips have no ink"""
+    if gray.size == 0 or int(gray.max()) - int(gray.min()) < 64:
+        return np.zeros(gray.shape, dtype=bool)
+    _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    return ink > 0
+
+
+def segment_glyphs(ink):
+    """
+    Connected components of an ink mask, left to right, as (x, y, w, h) boxes.
+    Components that overlap horizontally are one glyph (a dotted or slashed zero).
+    """
+    count, _, boxes, _ = cv2.connectedComponentsWithStats(ink.astype(np.uint8), connectivity=8)
+    glyphs = []
+    for x, y, w, h in sorted(tuple(int(v) for v in boxes[i][:4]) for i in range(1, count) if boxes[i][4] >= 2):
+        if glyphs and x < glyphs[-1][0] + glyphs[-1][2]:
+            px, py, pw, ph = glyphs[-1]
+            top, bottom = min(py, y), max(py + ph, y + h)
+            glyphs[-1] = (px, top, max(px + pw, x + w) - px, bottom - top)
+        else:
+            glyphs.append((x, y, w, h))
+    return glyphs
+
+
+def glyph_vectors(ink, boxes):
+    """Zero-mean, unit-length vectors of the glyphs, one row per box, for correlation"""
+    vectors = np.empty((len(boxes), GLYPH_SIZE[0] * GLYPH_SIZE[1]), dtype=np.float32)
+    for i, (x, y, w, h) in enumerate(boxes):
+        crop = ink[y:y+h, x:x+w].astype(np.float32)
+        vectors[i] = cv2.resize(crop, GLYPH_SIZE, interpolation=cv2.INTER_AREA).ravel()
+    vectors -= vectors.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def group_words(boxes):
+    """Split left-to-right glyph boxes into words wherever the gap is wider than a glyph"""
+    words = []
+    for box in boxes:
+        if words:
+            last = words[-1][-1]
+            if box[0] - (last[0] + last[2]) <= max(last[2], box[2]):
+                words[-1].append(box)
+                continue
+        words.append([box])
+    return words
+
+
+class GlyphAtlas:
+    """
+    Digit recognizer for the terminal's fixed font. Glyphs are connected components
+    matched against templates by normalized correlation, all at once with one matrix
+    product. Templates are learned from words tesseract read with high confidence, so
+    the atlas fills itself in as the workflow runs. A strip is only read here when
+    every glyph matches confidently; anything ambiguous is left to tesseract.
+    """
+
+    def __init__(self):
+        self.templates = np.empty((0, GLYPH_SIZE[0] * GLYPH_SIZE[1]), dtype=np.float32)
+        self.labels = np.empty(0, dtype='<U1')
+        self.sizes = np.empty((0, 2), dtype=np.int32)   # Width, height of each template's glyph
+        self.reads = 0
+        self.ambiguous = 0
+        self.learned_words = 0
+
+    def read(self, gray):
+        """
+        Words in a dark-on-light strip as ocr_words would return them, or None if any
+        glyph is ambiguous or the atlas cannot read it yet.
+        """
+        ink = ink_mask(gray)
+        boxes = segment_glyphs(ink)
+        if not boxes:
+            self.reads += 1
+            return []
+        if len(set(self.labels.tolist())) < 10:
+            return None  # Until every digit has a template, an unknown digit could pass as another
+
+        vectors = glyph_vectors(ink, boxes)
+        scores = vectors @ self.templates.T
+        sizes = np.array([(w, h) for _, _, w, h in boxes])
+        # A template only matches glyphs of (nearly) its own pixel size; the font is fixed
+        size_ok = (np.abs(sizes[:, None, :] - self.sizes[None, :, :]) <= 1).all(axis=2)
+        scores = np.where(size_ok, scores, -1.0)
+
+        best = scores.argmax(axis=1)
+        best_score = scores[np.arange(len(boxes)), best]
+        best_label = self.labels[best]
+        runner_up = np.where(self.labels[None, :] != best_label[:, None], scores, -1.0).max(axis=1)
+        if (best_score < MATCH_SCORE).any() or (best_score - runner_up < MATCH_MARGIN).any():
+            self.ambiguous += 1
+            return None
+
+        labels = dict(zip(boxes, best_label))
+        confidence = dict(zip(boxes, best_score))
+        words = []
+        for word_boxes in group_words(boxes):
+            text = ''.join(labels[box] for box in word_boxes)
+            if len(text) < 8:
+                continue
+            left = word_boxes[0][0]
+            top = min(y for _, y, _, _ in word_boxes)
+            words.append({
+                'text': text,
+                'order_ids': [text],
+                'left': left,
+                'top': top,
+                'width': word_boxes[-1][0] + word_boxes[-1][2] - left,
+                'height': max(y + h for _, y, _, h in word_boxes) - top,
+                'confidence': round(float(min(confidence[box] for box in word_boxes)) * 100, 1)
+            })
+        self.reads += 1
+        return words
+
+    def learn(self, gray, words):
+        """Add glyph templates from tesseract words (strip coordinates) read with high confidence"""
+        ink = ink_mask(gray)
+        boxes = segment_glyphs(ink)
+        for word in words:
+            text = word['text']
+            if word['confidence'] < LEARN_CONFIDENCE or not text.isdigit():
+                continue
+            word_boxes = [box for box in boxes
+                          if word['left'] - 2 <= box[0] and box[0] + box[2] <= word['left'] + word['width'] + 2]
+            if len(word_boxes) != len(text):
+                continue  # Touching or broken glyphs; the components don't line up with the digits
+
+            vectors = glyph_vectors(ink, word_boxes)
+            for digit, vector, (_, _, w, h) in zip(text, vectors, word_boxes):
+                known = self.labels == digit
+                if known.sum() >= TEMPLATES_PER_DIGIT:
+                    continue
+                if known.any() and (self.templates[known] @ vector).max() > 0.98:
+                    continue  # Already have an equivalent template
+                self.templates = np.vstack([self.templates, vector])
+                self.labels = np.append(self.labels, digit)
+                self.sizes = np.vstack([self.sizes, (w, h)])
+            self.learned_words += 1
+
+    def stats(self):
+        return {
+            'templates': len(self.templates),
+            'digits_known': ''.join(sorted(set(self.labels.tolist()))),
+            'strips_read': self.reads,
+            'strips_ambiguous': self.ambiguous,
+            'words_learned_from': self.learned_words
+        }
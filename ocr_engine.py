@@ -0,0 +1,143 @@
+import re
+
+import numpy as np
+from PIL import Image
+import pytesseract
+
+DATA_KEYS = ('text', 'left', 'top', 'width', 'height', 'conf')
+
+
+class OcrEngine:
+    """
+    Tesseract behind one interface. Configs use the pytesseract command-line syntax
+    ('--oem 3 --psm 6 -c tessedit_char_whitelist=0123456789') whatever the backend,
+    and image_to_data returns the pytesseract Output.DICT keys the callers read.
+    """
+
+    name = None
+
+    def image_to_string(self, image, config=''):
+        raise NotImplementedError
+
+    def image_to_data(self, image, config=''):
+        raise NotImplementedError
+
+
+class PytesseractEngine(OcrEngine):
+    """One tesseract process per call; needs only the tesseract binary"""
+
+    name = 'pytesseract'
+
+    def image_to_string(self, image, config=''):
+        return pytesseract.image_to_string(image, config=config)
+
+    def image_to_data(self, image, config=''):
+        return pytesseract.image_to_data(image, config=config, output_type=pytesseract.Output.DICT)
+
+
+def parse_config(config):
+    """Split a pytesseract config string into (psm, oem, {variable: value})"""
+    psm = re.search(r'--psm\s+(\d+)', config)
+    oem = re.search(r'--oem\s+(\d+)', config)
+    variables = dict(re.findall(r'-c\s+(\w+)=(\S*)', config))
+    return (int(psm.group(1)) if psm else 3), (int(oem.group(1)) if oem else 3), variables
+
+
+class TesserocrEngine(OcrEngine):
+    """
+    In-process tesseract through tesserocr. The model loads once per OEM, and
+    variables such as the digit whitelist are only set when a call needs a
+    different value from the one already set.
+    """
+
+    name = 'tesserocr'
+
+    def __init__(self, lang='eng'):
+        import tesserocr  # Optional; needs the tesseract C++ library, not just the binary
+
+        self.tesserocr = tesserocr
+        self.lang = lang
+        self.apis = {}        # OEM -> PyTessBaseAPI
+        self.variables = {}   # OEM -> variables currently set on that API
+
+    def api(self, config):
+        psm, oem, variables = parse_config(config)
+        if oem not in self.apis:
+            # tesserocr's OEM and PSM are namespaces of plain ints, not constructible enums
+            self.apis[oem] = self.tesserocr.PyTessBaseAPI(lang=self.lang, oem=oem)
+            self.variables[oem] = {}
+
+        api = self.apis[oem]
+        api.SetPageSegMode(psm)
+        current = self.variables[oem]
+        # Variables a previous config set and this one doesn't are reset to tesseract's default
+        for name in set(current) - set(variables):
+            api.SetVariable(name, '')
+            del current[name]
+        for name, value in variables.items():
+            if current.get(name) != value:
+                api.SetVariable(name, value)
+                current[name] = value
+        return api
+
+    def set_image(self, image, config):
+        api = self.api(config)
+        if not isinstance(image, Image.Image):
+            image = Image.fromarray(np.asarray(image))
+        api.SetImage(image)
+        return api
+
+    def image_to_string(self, image, config=''):
+        return self.set_image(image, config).GetUTF8Text()
+
+    def image_to_data(self, image, config=''):
+        api = self.set_image(image, config)
+        api.Recognize()
+        data = {key: [] for key in DATA_KEYS}
+        level = self.tesserocr.RIL.WORD
+        iterator = api.GetIterator()
+        if iterator is None:
+            return data
+
+        for word in self.tesserocr.iterate_level(iterator, level):
+            try:
+                text = word.GetUTF8Text(level)
+            except RuntimeError:
+                continue  # tesserocr raises for a word with no text; pytesseract just leaves it out
+            box = word.BoundingBox(level)
+            if not text or box is None:
+                continue
+            left, top, right, bottom = box
+            data['text'].append(text)
+            data['left'].append(left)
+            data['top'].append(top)
+            data['width'].append(right - left)
+            data['height'].append(bottom - top)
+            data['conf'].append(word.Confidence(level))
+        return data
+
+    def close(self):
+        for api in self.apis.values():
+            api.End()
+        self.apis.clear()
+        self.variables.clear()
+
+
+ENGINES = {engine.name: engine for engine in (PytesseractEngine, TesserocrEngine)}
+
+
+def create_engine(name='auto'):
+    """
+    'auto' prefers the persistent tesserocr engine, but only once a warm-up read has
+    gone through it; any failure there (no module, no tessdata, API errors) falls
+    back to pytesseract instead of surfacing on the workflow's first OCR call.
+    """
+    if name != 'auto':
+        return ENGINES[name]()
+    try:
+        engine = TesserocrEngine()
+        engine.image_to_data(Image.new('L', (64, 32), 255), config='--psm 7')  # Also loads the model up front
+        return engine
+    except Exception as e:
+        print(f"⚠️ tesserocr unavailable ({e}) - using pytesseract")
+        return PytesseractEngine()
@@ -0,0 +1,96 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytesseract
+
+from ocr_engine import PytesseractEngine, create_engine
+
+_worker_engine = None
+
+
+def _init_worker(engine_name, tesseract_cmd):
+    global _worker_engine
+    # Spawned workers (Windows) start from a fresh import, without the tesseract path set
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    _worker_engine = create_engine(engine_name)  # One engine (and loaded model) per worker
+
+
+def _recognize(engine, method, image, config):
+    """A failed recognition comes back as None rather than an exception"""
+    try:
+        return getattr(engine, method)(image, config=config)
+    except Exception:
+        return None
+
+
+def _run_job(method, image, config):
+    return _recognize(_worker_engine, method, image, config)
+
+
+class OcrPool:
+    """
+    Runs independent tesseract recognitions across a pool of worker processes.
+    Results always come back in the order the jobs were given. With stop_when, the
+    first accepted result (in job order) cancels everything after it that has not
+    started yet.
+    """
+
+    def __init__(self, workers=None, engine=None):
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.engine = engine if engine is not None else PytesseractEngine()  # Used for in-process runs
+        self.executor = None
+        self.jobs = 0
+        self.skipped = 0
+        self.last_ran = []  # Per job of the latest batch: True unless an early stop cancelled it first
+
+    def image_to_string_many(self, jobs, stop_when=None):
+        """
+        jobs is a list of (image, config). Returns one text per job; jobs skipped after
+        an early stop, and failed ones, are None.
+        """
+        return self._run_many('image_to_string', jobs, stop_when)
+
+    def image_to_data_many(self, jobs, stop_when=None):
+        """As image_to_string_many, with one image_to_data dict per job"""
+        return self._run_many('image_to_data', jobs, stop_when)
+
+    def _run_many(self, method, jobs, stop_when):
+        self.jobs += len(jobs)
+        if self.workers <= 1 or len(jobs) <= 1:
+            return self._run_in_order(method, jobs, stop_when)
+
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                initargs=(self.engine.name, pytesseract.pytesseract.tesseract_cmd))
+
+        futures = [self.executor.submit(_run_job, method, image, config) for image, config in jobs]
+        results = [None] * len(jobs)
+        self.last_ran = [True] * len(jobs)
+        for i, future in enumerate(futures):
+            results[i] = future.result()
+            if stop_when is not None and results[i] is not None and stop_when(results[i]):
+                for j in range(i + 1, len(futures)):
+                    if futures[j].cancel():  # False once a worker has picked the job up; that one still runs
+                        self.last_ran[j] = False
+                        self.skipped += 1
+                break
+        return results
+
+    def _run_in_order(self, method, jobs, stop_when):
+        results = [None] * len(jobs)
+        self.last_ran = [False] * len(jobs)
+        for i, (image, config) in enumerate(jobs):
+            results[i] = _recognize(self.engine, method, image, config)
+            self.last_ran[i] = True
+            if stop_when is not None and results[i] is not None and stop_when(results[i]):
+                self.skipped += len(jobs) - i - 1
+                break
+        return results
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def stats(self):
+        return {'workers': self.workers, 'jobs': self.jobs, 'skipped_by_early_stop': self.skipped}
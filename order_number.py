@@ -0,0 +1,154 @@
+import re
+from collections import defaultdict
+
+# The plain block first: on real MT5 headers the digits-only configs fold "Order" into
+# the number and score 0, so it is the stage that resolves them. The whitelisted
+# configs stay as fallbacks for headers the plain read gets wrong.
+DEFAULT_STAGES = (
+    ('block_plain', '--psm 6'),
+    ('line_digits', '--psm 7 -c tessedit_char_whitelist=0123456789#'),
+    ('block_digits', '--psm 6 -c tessedit_char_whitelist=0123456789#'),
+    ('word_digits', '--psm 8 -c tessedit_char_whitelist=0123456789#'),
+)
+ACCEPT_SCORE = 0.85        # A candidate at or above this ends the cascade
+UNANCHORED_WEIGHT = 0.75   # Numbers without a '#' (or "Order") in front are less likely the order id
+OFF_LENGTH_WEIGHT = 0.5    # Order ids are 8-10 digits; 7, 11 and 12 are kept only as a last resort
+
+DIGIT_RUN = re.compile(r'\d{7,12}')
+ORDER_WORD = re.compile(r'orde', re.IGNORECASE)
+
+
+def score_candidates(data):
+    """
+    Order-number candidates in image_to_data output, best first. Each is scored by
+    the word's tesseract confidence, whether a '#' or "Order" anchors it, and length.
+    """
+    candidates = []
+    previous = ''
+    for text, conf in zip(data['text'], data['conf']):
+        text = str(text).strip()
+        conf = float(conf)
+        if not text or conf < 0:
+            continue
+
+        for match in DIGIT_RUN.finditer(text):
+            before = text[:match.start()].rstrip()
+            anchored = before.endswith('#') or (not before and (previous.endswith('#') or bool(ORDER_WORD.search(previous))))
+            score = conf / 100
+            score *= 1.0 if anchored else UNANCHORED_WEIGHT
+            score *= 1.0 if 8 <= len(match.group()) <= 10 else OFF_LENGTH_WEIGHT
+            candidates.append({
+                'number': match.group(),
+                'score': round(score, 3),
+                'confidence': conf,
+                'anchored': anchored
+            })
+        previous = text
+    return sorted(candidates, key=lambda candidate: candidate['score'], reverse=True)
+
+
+class OrderNumberExtractor:
+    """
+    Staged order-number OCR for the order window header. Stages are tried in order
+    and the cascade stops at the first candidate scoring ACCEPT_SCORE or more.
+    When no stage gets there, the best candidate seen anywhere is used. With an
+    OcrPool the fallback stages run concurrently once the first stage has failed,
+    still accepted in stage order.
+    Every extraction records which stage resolved it, so the stage order can be
+    tuned from real runs.
+    """
+
+    def __init__(self, engine, stages=DEFAULT_STAGES, accept_score=ACCEPT_SCORE, pool=None):
+        self.engine = engine
+        self.pool = pool
+        self.stages = stages
+        self.accept_score = accept_score
+        self.stage_calls = defaultdict(int)
+        self.stage_resolved = defaultdict(int)
+        self.history = []
+
+    def accepts(self, data):
+        candidates = score_candidates(data)
+        return bool(candidates) and candidates[0]['score'] >= self.accept_score
+
+    def run_stage(self, i, image):
+        try:
+            return self.engine.image_to_data(image, config=self.stages[i][1])
+        except Exception as e:
+            print(f"  OCR stage {self.stages[i][0]} failed: {e}")
+            return None
+
+    def run_stages(self, image, early_exit):
+        """
+        (results, ran): image_to_data per stage in stage order, None for failed stages and
+        those not waited for, and whether each stage ran (an early exit may skip some)
+        """
+        results = [None] * len(self.stages)
+        ran = [False] * len(self.stages)
+        if self.pool is not None:
+            first = 0
+            if early_exit:
+                # The first stage resolves most headers on its own. Workers pick up every job as
+                # soon as it is queued, so the fallbacks only go to the pool once it hasn't.
+                results[0], ran[0] = self.run_stage(0, image), True
+                if results[0] is not None and self.accepts(results[0]):
+                    return results, ran
+                first = 1
+            jobs = [(image, config) for _, config in self.stages[first:]]
+            results[first:] = self.pool.image_to_data_many(jobs, stop_when=self.accepts if early_exit else None)
+            ran[first:] = self.pool.last_ran
+            return results, ran
+
+        for i in range(len(self.stages)):
+            results[i], ran[i] = self.run_stage(i, image), True
+            if early_exit and results[i] is not None and self.accepts(results[i]):
+                break
+        return results, ran
+
+    def extract(self, image, early_exit=True):
+        """Best candidate dict (number, score, stage, calls, ...) or None"""
+        results, ran = self.run_stages(image, early_exit)
+        calls = 0
+        for (name, _), stage_ran in zip(self.stages, ran):
+            if stage_ran:  # Pool stages past the accepted one may still have run; they cost a call too
+                calls += 1
+                self.stage_calls[name] += 1
+
+        best = None
+        for (name, _), data in zip(self.stages, results):
+            if data is None:
+                continue
+
+            candidates = score_candidates(data)
+            if candidates:
+                print(f"  {name}: {candidates[0]['number']} (score {candidates[0]['score']})")
+            if candidates and (best is None or candidates[0]['score'] > best['score']):
+                best = dict(candidates[0], stage=name)
+            if early_exit and best is not None and best['score'] >= self.accept_score:
+                break
+
+        if best is not None:
+            best['calls'] = calls
+            best['accepted'] = best['score'] >= self.accept_score
+            resolved_by = best['stage'] if best['accepted'] else 'best_effort'
+        else:
+            resolved_by = 'unresolved'
+
+        self.stage_resolved[resolved_by] += 1
+        self.history.append({
+            'number': best['number'] if best else None,
+            'resolved_by': resolved_by,
+            'score': best['score'] if best else None,
+            'calls': calls
+        })
+        return best
+
+    def stats(self):
+        extractions = len(self.history)
+        return {
+            'extractions': extractions,
+            'mean_calls': round(sum(entry['calls'] for entry in self.history) / extractions, 2) if extractions else 0.0,
+            'stage_calls': dict(self.stage_calls),
+            'resolved_by': dict(self.stage_resolved),
+            'history': self.history
+        }
@@ -0,0 +1,310 @@
+import hashlib
+import re
+import time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+from lru import LRUCache
+from ocr_engine import PytesseractEngine
+
+DIGITS_CONFIG = r'--oem 3 --psm 6 -c tessedit_char_whitelist=0123456789'
+ORDER_ID = re.compile(r'\d{8,}')
+SCALE = 2  # Upscale factor applied before OCR; word boxes are mapped back by it
+ROW_HEIGHT = 20  # Pixel height of one row in the terminal's order list
+STRIP_GAP = 8    # Blank pixels between stacked row strips so tesseract keeps them on separate lines
+
+# Selected rows are white text on blue, which thresholds away with the background
+LOWER_BLUE = np.array([90, 50, 50])
+UPPER_BLUE = np.array([140, 255, 255])
+
+
+def selected_row_boxes(img):
+    """Bounding boxes (x, y, w, h) of the blue highlighted rows in a BGR image"""
+    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+    blue_mask = cv2.inRange(hsv, LOWER_BLUE, UPPER_BLUE)
+    contours, _ = cv2.findContours(blue_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    boxes = [cv2.boundingRect(contour) for contour in contours]
+    return [(x, y, w, h) for x, y, w, h in boxes if w >= 50 and h >= 15]
+
+
+def normalized_gray(img, selected_boxes):
+    """Grayscale with the selected rows inverted, so every row reads dark-on-light"""
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    for x, y, w, h in selected_boxes:
+        # Stretch after inverting, or the mid-gray inverted blue thresholds as ink
+        gray[y:y+h, x:x+w] = cv2.normalize(255 - gray[y:y+h, x:x+w], None, 0, 255, cv2.NORM_MINMAX)
+    return gray
+
+
+def binarize(gray):
+    """Upscale, denoise and binarize a dark-on-light image for OCR"""
+    scaled = cv2.resize(gray, None, fx=SCALE, fy=SCALE, interpolation=cv2.INTER_CUBIC)
+    denoised = cv2.fastNlMeansDenoising(scaled)
+    _, thresh = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return thresh
+
+
+def prepare_frame(img, selected_boxes):
+    """Normalize the selected rows, then upscale, denoise and binarize for a single OCR pass"""
+    return binarize(normalized_gray(img, selected_boxes))
+
+
+def ocr_words(data):
+    """Words of at least 8 characters from image_to_data output, in unscaled pixels"""
+    words = []
+    for i in range(len(data['text'])):
+        text = str(data['text'][i]).strip()
+        if len(text) < 8:
+            continue
+
+        words.append({
+            'text': text,
+            'order_ids': ORDER_ID.findall(text),
+            'left': int(data['left'][i] / SCALE),
+            'top': int(data['top'][i] / SCALE),
+            'width': int(data['width'][i] / SCALE),
+            'height': int(data['height'][i] / SCALE),
+            'confidence': float(data['conf'][i])
+        })
+    return words
+
+
+def is_selected(word, selected_boxes):
+    center_y = word['top'] + word['height'] // 2
+    return any(y <= center_y < y + h for _, y, _, h in selected_boxes)
+
+
+class FrameAnalysis:
+    """
+    Order ids read from one captured frame, with their boxes (in screenshot pixels)
+    and confidences. Built from a single image_to_data call and shared by every step
+    that needs to know what is on screen.
+    """
+
+    def __init__(self, words, offset=(0, 0)):
+        self.words = words
+        self.offset = offset
+        self.by_order_id = {}  # Order id -> words holding it, for exact lookups
+        for word in words:
+            for order in word['order_ids']:
+                self.by_order_id.setdefault(order, []).append(word)
+
+    @classmethod
+    def from_ocr_data(cls, data, selected_boxes, offset=(0, 0)):
+        words = ocr_words(data)
+        for word in words:
+            word['selected'] = is_selected(word, selected_boxes)
+        return cls(words, offset)
+
+    def order_ids(self):
+        """Unique order ids, top to bottom"""
+        orders = []
+        for word in self.words:
+            for order in word['order_ids']:
+                if order not in orders:
+                    orders.append(order)
+        return orders
+
+    def selected_order_ids(self):
+        return [order for word in self.words if word['selected'] for order in word['order_ids']]
+
+    def locate(self, order_id):
+        """Screen locations of the words containing order_id, as find_order_location returns them"""
+        # Ids come from this frame's own reads, so the dict almost always has them
+        words = self.by_order_id.get(order_id) or [word for word in self.words if order_id in word['text']]
+        return [{
+            'text': word['text'],
+            'screen_x': word['left'] + self.offset[0],
+            'screen_y': word['top'] + self.offset[1],
+            'width': word['width'],
+            'height': word['height'],
+            'confidence': word['confidence']
+        } for word in words]
+
+
+def analyze_frame(screenshot, offset=(0, 0), engine=None):
+    """Read every order id in a captured list frame with one tesseract call"""
+    engine = engine if engine is not None else PytesseractEngine()
+    img = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+    selected_boxes = selected_row_boxes(img)
+    thresh = prepare_frame(img, selected_boxes)
+    data = engine.image_to_data(thresh, config=DIGITS_CONFIG)
+    return FrameAnalysis.from_ocr_data(data, selected_boxes, offset)
+
+
+def frame_digest(screenshot):
+    """blake2b of a frame's pixels, the key repeat frames are found by"""
+    return hashlib.blake2b(np.ascontiguousarray(np.asarray(screenshot)).tobytes(), digest_size=16).digest()
+
+
+class FrameOcrCache:
+    """
+    OCR results for recently seen frames, keyed by a hash of their pixels, so a view
+    the list returns to (the same rows, selection and all) skips tesseract. Only an
+    exact match is reused: one changed digit must be read again, or clicks would go
+    to the wrong order. Tracks the OCR time spent on misses and the time each hit saved.
+    """
+
+    def __init__(self, maxsize=64, reader=None):
+        self.cache = LRUCache(maxsize)
+        self.reader = reader if reader is not None else analyze_frame  # Called on misses
+        self.ocr_seconds = 0.0
+        self.saved_seconds = 0.0
+
+    def analyze(self, screenshot, offset=(0, 0), digest=None):
+        """digest, when the caller already has frame_digest(screenshot), saves hashing it again"""
+        key = digest if digest is not None else frame_digest(screenshot)
+        cached = self.cache.get(key)
+        if cached is not None:
+            words, elapsed = cached
+            self.saved_seconds += elapsed
+            return FrameAnalysis(words, offset)
+
+        start = time.perf_counter()
+        analysis = self.reader(screenshot, offset)
+        elapsed = time.perf_counter() - start
+        self.ocr_seconds += elapsed
+        self.cache.put(key, (analysis.words, elapsed))
+        return analysis
+
+    def stats(self):
+        stats = self.cache.stats()
+        stats['ocr_seconds'] = round(self.ocr_seconds, 3)
+        stats['ocr_seconds_saved'] = round(self.saved_seconds, 3)
+        return stats
+
+
+def segment_rows(gray, row_height=ROW_HEIGHT):
+    """
+    Tops of fixed-height row strips in a dark-on-light list capture. Text lines are
+    found from the horizontal projection profile (rows of pixels holding any ink) and
+    each strip is centred on one of them.
+    """
+    _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    profile = np.concatenate(([0], (np.count_nonzero(ink, axis=1) > 0).astype(np.int8), [0]))
+    edges = np.diff(profile)
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+    tops = []
+    max_top = max(0, gray.shape[0] - row_height)
+    for start, end in zip(starts, ends):
+        center = (start + end) // 2
+        if tops and center < tops[-1] + row_height:
+            continue  # Part of the line the previous strip already covers
+        tops.append(int(min(max(center - row_height // 2, 0), max_top)))
+    return tops
+
+
+class RowOcrReader:
+    """
+    Incremental OCR of the order list. Each capture is cut into row strips, and only
+    strips whose pixels have not been seen before are read, stacked into a single
+    tesseract call. Scrolling by a few rows therefore OCRs only the rows that scrolled
+    in. Every order id read is kept in a rolling index with its last screen y.
+    With a glyph atlas, new strips it can read confidently skip tesseract too.
+    """
+
+    def __init__(self, maxsize=512, row_height=ROW_HEIGHT, glyphs=None, engine=None):
+        self.row_height = row_height
+        self.engine = engine if engine is not None else PytesseractEngine()
+        self.glyphs = glyphs               # Optional glyph_ocr.GlyphAtlas fast path
+        self.strips = LRUCache(maxsize)    # Strip pixel hash -> words relative to the strip
+        self.row_index = OrderedDict()     # Order id -> {'screen_y', 'frame'}, newest last
+        self.maxsize = maxsize
+        self.frames = 0
+        self.strips_seen = 0
+        self.strips_read = 0               # New strips, whichever recognizer read them
+        self.strips_tesseract = 0
+        self.tesseract_calls = 0
+
+    def analyze(self, screenshot, offset=(0, 0)):
+        img = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+        selected_boxes = selected_row_boxes(img)
+        gray = normalized_gray(img, selected_boxes)
+        self.frames += 1
+
+        strips = []
+        unseen = {}
+        for top in segment_rows(gray, self.row_height):
+            pixels = gray[top:top + self.row_height]
+            key = hashlib.blake2b(pixels.tobytes(), digest_size=16).digest()
+            cached = self.strips.get(key)
+            if cached is None and key not in unseen:
+                unseen[key] = pixels
+            strips.append((top, key, cached))
+        self.strips_seen += len(strips)
+
+        self.strips_read += len(unseen)
+
+        read = {}
+        if self.glyphs is not None:
+            for key, pixels in list(unseen.items()):
+                words = self.glyphs.read(pixels)
+                if words is not None:
+                    read[key] = words
+                    self.strips.put(key, words)
+                    del unseen[key]
+        if unseen:
+            read.update(self.read_strips(unseen))
+
+        words = []
+        for top, key, cached in strips:
+            for word in (cached if cached is not None else read[key]):
+                word = dict(word, top=word['top'] + top)
+                word['selected'] = is_selected(word, selected_boxes)
+                words.append(word)
+
+        analysis = FrameAnalysis(words, offset)
+        self.index_rows(analysis)
+        return analysis
+
+    def read_strips(self, strips):
+        """OCR strips (hash -> pixels) stacked into one image; returns hash -> words"""
+        pitch = self.row_height + STRIP_GAP
+        width = max(pixels.shape[1] for pixels in strips.values())
+        stack = np.full((STRIP_GAP + len(strips) * pitch, width), 255, dtype=np.uint8)
+        for i, pixels in enumerate(strips.values()):
+            stack[STRIP_GAP + i * pitch:STRIP_GAP + i * pitch + self.row_height, :pixels.shape[1]] = pixels
+
+        data = self.engine.image_to_data(binarize(stack), config=DIGITS_CONFIG)
+        self.tesseract_calls += 1
+        self.strips_tesseract += len(strips)
+
+        read = {key: [] for key in strips}
+        keys = list(strips)
+        for word in ocr_words(data):
+            i = (word['top'] + word['height'] // 2 - STRIP_GAP) // pitch
+            if 0 <= i < len(keys):
+                word['top'] -= STRIP_GAP + i * pitch
+                read[keys[i]].append(word)
+
+        for key, words in read.items():
+            self.strips.put(key, words)
+            if self.glyphs is not None:
+                self.glyphs.learn(strips[key], words)
+        return read
+
+    def index_rows(self, analysis):
+        for word in analysis.words:
+            for order in word['order_ids']:
+                self.row_index[order] = {
+                    'screen_y': word['top'] + word['height'] // 2 + analysis.offset[1],
+                    'frame': self.frames
+                }
+                self.row_index.move_to_end(order)
+        while len(self.row_index) > self.maxsize:
+            self.row_index.popitem(last=False)
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'strips_seen': self.strips_seen,
+            'strips_read': self.strips_read,
+            'strip_reuse_rate': 1 - self.strips_read / self.strips_seen if self.strips_seen else 0.0,
+            'strips_tesseract': self.strips_tesseract,
+            'tesseract_calls': self.tesseract_calls,
+            'indexed_orders': len(self.row_index),
+            'glyphs': self.glyphs.stats() if self.glyphs is not None else None
+        }
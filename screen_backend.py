@@ -0,0 +1,314 @@
+import time
+
+from PIL import Image, ImageDraw, ImageFont
+
+
+class ScreenBackend:
+    """Screen capture, mouse, keyboard and sleep used by IntegratedOrderProcessor"""
+
+    def screenshot(self, region=None):
+        raise NotImplementedError
+
+    def click(self, x, y):
+        raise NotImplementedError
+
+    def double_click(self, x, y):
+        raise NotImplementedError
+
+    def ctrl_click(self, x, y):
+        """Click with Ctrl held, adding the row under the cursor to the selection"""
+        raise NotImplementedError
+
+    def move_to(self, x, y, duration=0.0):
+        raise NotImplementedError
+
+    def position(self):
+        raise NotImplementedError
+
+    def size(self):
+        raise NotImplementedError
+
+    def press(self, key):
+        raise NotImplementedError
+
+    def hotkey(self, *keys):
+        raise NotImplementedError
+
+    def sleep(self, seconds):
+        raise NotImplementedError
+
+    def now(self):
+        """Clock the backend runs on; the simulator's only advances on sleeps"""
+        raise NotImplementedError
+
+
+class PyAutoGuiBackend(ScreenBackend):
+    """The live MT5 terminal, driven through pyautogui"""
+
+    def __init__(self, pause=0.2):
+        import pyautogui  # Needs a display, so only imported when driving a real screen
+
+        self.pyautogui = pyautogui
+        pyautogui.FAILSAFE = True
+        pyautogui.PAUSE = pause
+
+    def screenshot(self, region=None):
+        return self.pyautogui.screenshot(region=region)
+
+    def click(self, x, y):
+        self.pyautogui.click(x, y)
+
+    def double_click(self, x, y):
+        self.pyautogui.doubleClick(x, y)
+
+    def ctrl_click(self, x, y):
+        self.pyautogui.keyDown('ctrl')
+        try:
+            self.pyautogui.click(x, y)
+        finally:
+            self.pyautogui.keyUp('ctrl')  # Never leave Ctrl stuck down
+
+    def move_to(self, x, y, duration=0.0):
+        self.pyautogui.moveTo(x, y, duration=duration)
+
+    def position(self):
+        return tuple(self.pyautogui.position())
+
+    def size(self):
+        return tuple(self.pyautogui.size())
+
+    def press(self, key):
+        self.pyautogui.press(key)
+
+    def hotkey(self, *keys):
+        self.pyautogui.hotkey(*keys)
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def now(self):
+        return time.perf_counter()
+
+
+class SimulatorBackend(ScreenBackend):
+    """
+    Headless stand-in for the MT5 terminal: renders a synthetic order list from a
+    fixture of order ids and reacts to arrow keys, (Ctrl-)clicks, double-clicks, Escape,
+    the single-order delete sequence and Delete on a selection, so the whole workflow can be profiled without a live terminal.
+    Sleeps advance a virtual clock instead of blocking.
+    """
+
+    SCREEN_SIZE = (1920, 1080)
+    LIST_AREA = (400, 171, 1500, 820)   # left, top, right, bottom of the clickable order rows
+    ID_COLUMN_X = 637                   # Where order ids are drawn, inside the captured list region
+    ROW_HEIGHT = 20
+    DIALOG_AREA = (600, 120, 1400, 860)
+    DIALOG_TITLE_AT = (640, 160)        # Inside the region extract_order_number_from_interface reads
+    DIALOG_EDIT_FIELD = (964, 281)      # First click of the delete sequence
+    DIALOG_DELETE_BUTTON = (1331, 832)
+
+    def __init__(self, order_ids, pause=0.05, action_cost=0.05, repaint_delay=0.0):
+        self.orders = [str(order_id) for order_id in order_ids]
+        self.pause = pause                # Mirrors pyautogui.PAUSE on the virtual clock
+        self.action_cost = action_cost    # Virtual seconds the terminal needs to react to an input
+        self.repaint_delay = repaint_delay  # Screenshots show the old screen until this long after the last input
+        self.clock = 0.0
+        self.acted_at = 0.0
+        self.shown = None                 # Last repainted screen
+        self.mouse = (self.SCREEN_SIZE[0] // 2, self.SCREEN_SIZE[1] // 2)
+        self.visible_rows = (self.LIST_AREA[3] - self.LIST_AREA[1]) // self.ROW_HEIGHT
+        self.scroll_top = max(0, len(self.orders) - self.visible_rows)  # History opens scrolled to the newest
+        self.selected = set()
+        self.cursor = None
+        self.dialog_order = None
+        self.dialog_stage = None          # 'order' -> 'edit' -> 'confirm' while the delete sequence runs
+        self.confirm_rows = None          # Selected rows awaiting confirmation after Delete in the list
+        self.deleted = []
+        self.counts = {'screenshots': 0, 'clicks': 0, 'keys': 0}
+
+        try:
+            self.font = ImageFont.truetype('DejaVuSansMono.ttf', 14)
+            self.title_font = ImageFont.truetype('DejaVuSansMono.ttf', 20)
+        except OSError:
+            self.font = self.default_font(14)
+            self.title_font = self.default_font(20)
+
+    @staticmethod
+    def default_font(size):
+        try:
+            return ImageFont.load_default(size=size)
+        except TypeError:
+            return ImageFont.load_default()  # Pillow < 10.1: the fixed-size bitmap font only
+
+    # Rendering
+
+    def render(self):
+        screen = Image.new('RGB', self.SCREEN_SIZE, (240, 240, 240))
+        draw = ImageDraw.Draw(screen)
+        left, top, right, bottom = self.LIST_AREA
+        draw.rectangle((left, top, right, bottom), fill=(255, 255, 255))
+
+        for row in range(self.visible_rows):
+            index = self.scroll_top + row
+            if index >= len(self.orders):
+                break
+            y = top + row * self.ROW_HEIGHT
+            if index in self.selected:
+                draw.rectangle((left, y, right, y + self.ROW_HEIGHT - 1), fill=(51, 102, 204))
+                color = (255, 255, 255)
+            else:
+                color = (0, 0, 0)
+            draw.text((self.ID_COLUMN_X, y + 2), self.orders[index], fill=color, font=self.font)
+
+        if self.dialog_order is not None:
+            draw.rectangle(self.DIALOG_AREA, fill=(250, 250, 250), outline=(0, 0, 0))
+            draw.text(self.DIALOG_TITLE_AT, f"Order #{self.dialog_order} ", fill=(0, 0, 0), font=self.title_font)
+            if self.dialog_stage in ('edit', 'confirm'):
+                field_x, field_y = self.DIALOG_EDIT_FIELD
+                draw.rectangle((field_x - 80, field_y - 12, field_x + 80, field_y + 12), outline=(51, 102, 204), width=2)
+            if self.dialog_stage == 'confirm':
+                self.draw_delete_button(draw)
+        elif self.confirm_rows is not None:
+            draw.rectangle(self.DIALOG_AREA, fill=(250, 250, 250), outline=(0, 0, 0))
+            draw.text(self.DIALOG_TITLE_AT, f"Delete {len(self.confirm_rows)} orders?", fill=(0, 0, 0), font=self.title_font)
+            self.draw_delete_button(draw)
+
+        return screen
+
+    def draw_delete_button(self, draw):
+        button_x, button_y = self.DIALOG_DELETE_BUTTON
+        draw.rectangle((button_x - 40, button_y - 12, button_x + 40, button_y + 12), fill=(200, 60, 60))
+
+    def screenshot(self, region=None):
+        self.counts['screenshots'] += 1
+        if self.shown is None or self.clock >= self.acted_at + self.repaint_delay:
+            self.shown = self.render()
+        screen = self.shown
+        if region is None:
+            return screen
+        left, top, width, height = region
+        return screen.crop((left, top, left + width, top + height))
+
+    # Input
+
+    def row_at(self, x, y):
+        left, top, right, bottom = self.LIST_AREA
+        if not (left <= x <= right and top <= y < bottom):
+            return None
+        index = self.scroll_top + (y - top) // self.ROW_HEIGHT
+        return index if index < len(self.orders) else None
+
+    def click(self, x, y):
+        self.counts['clicks'] += 1
+        self.mouse = (x, y)
+        self.advance(self.action_cost)
+
+        if self.dialog_order is not None:
+            if self.near(x, y, self.DIALOG_EDIT_FIELD, 80, 12):
+                self.dialog_stage = 'edit'
+            elif self.dialog_stage == 'confirm' and self.near(x, y, self.DIALOG_DELETE_BUTTON, 40, 12):
+                self.delete_rows([self.orders.index(self.dialog_order)])
+                self.dialog_order = None
+                self.dialog_stage = None
+            return
+
+        if self.confirm_rows is not None:
+            if self.near(x, y, self.DIALOG_DELETE_BUTTON, 40, 12):
+                self.delete_rows(self.confirm_rows)
+                self.confirm_rows = None
+            return
+
+        row = self.row_at(x, y)
+        if row is not None:
+            self.cursor = row
+            self.selected = {row}
+
+    def ctrl_click(self, x, y):
+        self.counts['clicks'] += 1
+        self.mouse = (x, y)
+        self.advance(self.action_cost)
+        row = self.row_at(x, y)
+        if self.dialog_order is None and self.confirm_rows is None and row is not None:
+            self.cursor = row
+            self.selected ^= {row}
+
+    def double_click(self, x, y):
+        self.click(x, y)
+        row = self.row_at(x, y)
+        if row is not None and self.dialog_order is None and self.confirm_rows is None:
+            self.dialog_order = self.orders[row]
+            self.dialog_stage = 'order'
+            self.advance(self.action_cost)
+
+    def move_to(self, x, y, duration=0.0):
+        self.mouse = (x, y)
+        self.advance(duration)
+
+    def position(self):
+        return self.mouse
+
+    def size(self):
+        return self.SCREEN_SIZE
+
+    def press(self, key):
+        self.counts['keys'] += 1
+        self.advance(self.action_cost)
+        key = key.lower()
+
+        if self.dialog_order is not None:
+            if key == 'escape':
+                self.dialog_order = None
+                self.dialog_stage = None
+            elif key == 'enter' and self.dialog_stage == 'edit':
+                self.dialog_stage = 'confirm'
+            return
+
+        if self.confirm_rows is not None:
+            if key == 'escape':
+                self.confirm_rows = None
+            return
+
+        if key == 'delete' and self.selected:
+            self.confirm_rows = sorted(self.selected)
+            return
+
+        moves = {'up': -1, 'down': 1, 'pageup': -self.visible_rows, 'pagedown': self.visible_rows,
+                 'home': -len(self.orders), 'end': len(self.orders)}
+        if key in moves and self.orders:
+            start = self.cursor if self.cursor is not None else self.scroll_top
+            self.cursor = max(0, min(len(self.orders) - 1, start + moves[key]))
+            self.selected = {self.cursor}
+            self.scroll_to(self.cursor)
+
+    def hotkey(self, *keys):
+        self.counts['keys'] += 1
+        self.advance(self.action_cost)
+
+    @staticmethod
+    def near(x, y, point, half_width, half_height):
+        return abs(x - point[0]) <= half_width and abs(y - point[1]) <= half_height
+
+    def delete_rows(self, rows):
+        for row in sorted(rows, reverse=True):
+            self.deleted.append(self.orders.pop(row))
+        self.selected = set()
+        self.cursor = None
+        self.scroll_top = max(0, min(self.scroll_top, len(self.orders) - self.visible_rows))
+
+    def scroll_to(self, row):
+        if row < self.scroll_top:
+            self.scroll_top = row
+        elif row >= self.scroll_top + self.visible_rows:
+            self.scroll_top = row - self.visible_rows + 1
+
+    # Time
+
+    def advance(self, seconds):
+        self.clock += seconds + self.pause
+        self.acted_at = self.clock
+
+    def sleep(self, seconds):
+        self.clock += seconds
+
+    def now(self):
+        return self.clock
@@ -1,4 +1,3 @@
-import pyautogui
 import cv2
 import numpy as np
 from PIL import Image
@@ -6,30 +5,73 @@ import pytesseract
 import re
 import json
 from datetime import datetime
-import time
 import os
 import random
+from screen_backend import PyAutoGuiBackend
+from ui_wait import UiWaiter
+from frame_capture import FrameCapture
+from frame_archive import FrameArchive, RetentionPolicy
+from order_ocr import FrameOcrCache, RowOcrReader, ROW_HEIGHT
+from ocr_pool import OcrPool
+from glyph_ocr import GlyphAtlas
+from ocr_engine import create_engine
+from order_number import OrderNumberExtractor
+from target_index import TargetIndex, normalize_order_id
+from scroll_model import ScrollModel, SweepIndex, frame_rows, jump_keys
 
 # Set Tesseract path
-pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+if os.name == 'nt':
+    pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
 class IntegratedOrderProcessor:
-    def __init__(self):
+    # Screen regions (left, top, width, height) polled to tell when the terminal is ready
+    ORDER_NUMBER_REGION = (626, 135, 290, 92)   # Order window header with the order number
+    LIST_REGION = (627, 171, 147, 649)          # Order list column captured by click_and_screenshot
+    DELETE_FIELD_REGION = (864, 261, 200, 40)   # Around the first delete-sequence click
+    CONFIRM_REGION = (1231, 802, 200, 60)       # Around the confirmation button
+
+    def __init__(self, backend=None, ocr_workers=None, ocr_early_stop=True, ocr_engine=None, batch_delete=False,
+                 sweep_first=False, save_frames=False, archive=None):
+        # Screen, mouse and keyboard access; the live terminal unless a simulator is passed in.
+        # The live terminal keeps the 0.2s per-call pause: keystrokes into a field can't be waited on.
+        self.backend = backend if backend is not None else PyAutoGuiBackend(pause=0.2)
+        self.waiter = UiWaiter(self.backend)
+        # Persistent in-process tesseract when tesserocr is installed, pytesseract otherwise
+        self.ocr_engine = ocr_engine if ocr_engine is not None else create_engine('auto')
+        self.ocr_pool = OcrPool(ocr_workers, self.ocr_engine)  # Independent recognitions run across cores
+        self.ocr_early_stop = ocr_early_stop  # Stop the OCR cascade once a confident number is read
+        self.order_number_extractor = OrderNumberExtractor(self.ocr_engine, pool=self.ocr_pool)
+        self.batch_delete = batch_delete      # Select every target in view and delete them in one go
+        self.batch_sizes = []
+        self.workflow_started = None
         self.search_history = []
         self.screenshot_offset = None
         self.shots_folder = "shots"
         self.processed_orders = set()
+        self.opened_orders = set()       # Targets whose row was double-clicked open, deleted or not
         self.found_orders = []
         self.target_orders = []
+        self.targets = TargetIndex([])   # Remaining targets, with OCR-error-tolerant lookup
+        self.visible_rows = self.LIST_REGION[3] // ROW_HEIGHT
+        self.scroll = ScrollModel(visible_rows=self.visible_rows)
+        self.sweep_first = sweep_first        # Index the whole list once, then delete by row offsets
+        self.sweep_stats = None
+        self.frame = None                # Analysis of the last captured list frame
+        self.frame_screenshot = None
+        self.frames_analyzed = 0
+        self.row_reader = RowOcrReader(glyphs=GlyphAtlas(), engine=self.ocr_engine)  # Only unseen rows are OCRed; known glyphs skip tesseract
+        self.ocr_cache = FrameOcrCache(reader=self.row_reader.analyze)  # Repeat frames skip tesseract
+        
+        # Saved frames are written on a background thread; the oldest go once shots/ is over the limits
+        self.archive = archive if archive is not None else FrameArchive(
+            self.shots_folder, retention=RetentionPolicy(max_files=1000, max_bytes=256 * 1024 * 1024))
+        # Frames come from the settled list wait, unchanged ones are reused; saved only on request or failure
+        self.capture = FrameCapture(self.backend, self.LIST_REGION, archive=self.archive, save_frames=save_frames)
         
         # Create shots folder if it doesn't exist
         if not os.path.exists(self.shots_folder):
             os.makedirs(self.shots_folder)
             print(f"📁 Created '{self.shots_folder}' folder for screenshots")
-            
-        # Configure pyautogui
-        pyautogui.FAILSAFE = True
-        pyautogui.PAUSE = 0.2
     
     def run_opening_script(self):
         """Execute opening.py functionality"""
@@ -45,13 +87,13 @@ class IntegratedOrderProcessor:
         try:
             for i, coord in enumerate(coordinates):
                 print(f"  Click {i+1}: ({coord['x']}, {coord['y']})")
-                pyautogui.click(coord['x'], coord['y'])
+                self.backend.click(coord['x'], coord['y'])
                 
                 if i < len(coordinates) - 1:
-                    time.sleep(1)
+                    self.waiter.wait_for_stable('opening_click', None, timeout=1)
             
             print("✅ Opening sequence completed!")
-            time.sleep(2)  # Wait for interface to load
+            self.waiter.wait_for_stable('opening_load', self.LIST_REGION, timeout=2)  # Wait for interface to load
             return True
             
         except Exception as e:
@@ -76,7 +118,7 @@ class IntegratedOrderProcessor:
         
         try:
             # Take screenshot of the defined area
-            screenshot = pyautogui.screenshot(region=(
+            screenshot = self.backend.screenshot(region=(
                 bbox['left'], 
                 bbox['top'], 
                 bbox['width'], 
@@ -105,73 +147,13 @@ class IntegratedOrderProcessor:
             # Convert back to PIL Image
             processed_image = Image.fromarray(scaled)
             
-            # Try multiple OCR configurations
-            configs = [
-                '--psm 6 -c tessedit_char_whitelist=0123456789#',
-                '--psm 7 -c tessedit_char_whitelist=0123456789#',
-                '--psm 8 -c tessedit_char_whitelist=0123456789#',
-                '--psm 6'
-            ]
-            
-            best_number = None
-            
-            for config in configs:
-                try:
-                    text = pytesseract.image_to_string(processed_image, config=config)
-                    print(f"  OCR text: '{text.strip()}'")
-                    
-                    # Updated patterns to handle # at start and space at end
-                    patterns = [
-                        r'#\s*(\d{7,12})\s',      # # followed by 8-10 digits followed by space
-                        r'#\s*(\d{7,12})$',       # # followed by 8-10 digits at end of line
-                        r'#\s*(\d{7,12})',        # # followed by 8-10 digits (fallback)
-                        r'Order[e\-]*\s*#?\s*(\d{7,12})\s',  # Order followed by optional # and 8-10 digits and space
-                        r'Orde[e\-]*\s*#?\s*(\d{7,12})\s',   # Handle OCR mistakes with space
-                    ]
-                    
-                    for pattern in patterns:
-                        matches = re.findall(pattern, text, re.IGNORECASE)
-                        if matches:
-                            candidate = matches[0]
-                            if 8 <= len(candidate) <= 10:
-                                best_number = candidate
-                                print(f"  Found order number: {candidate}")
-                                break
-                    
-                    if best_number:
-                        break
-                        
-                except Exception as e:
-                    continue
-            
-            # Fallback: Look for 8-10 digit numbers that might be after # and before space
-            if not best_number:
-                for config in ['--psm 6']:
-                    try:
-                        text = pytesseract.image_to_string(processed_image, config=config)
-                        # Look for pattern: # followed by digits followed by space or end
-                        fallback_patterns = [
-                            r'#\s*(\d{7,12})\s',
-                            r'#\s*(\d{7,12})$',
-                            r'#(\d{7,12})\s',
-                            r'(\d{7,12})\s'  # Just digits followed by space as last resort
-                        ]
-                        
-                        for pattern in fallback_patterns:
-                            numbers = re.findall(pattern, text)
-                            if numbers:
-                                best_number = numbers[0]
-                                print(f"  Found fallback number: {best_number}")
-                                break
-                        
-                        if best_number:
-                            break
-                    except:
-                        continue
-            
-            if best_number:
-                print(f"✅ Extracted order number: {best_number}")
-                return best_number
+            # Staged OCR: cheapest config first, stop once a candidate is confident enough
+            best = self.order_number_extractor.extract(processed_image, early_exit=self.ocr_early_stop)
+            
+            if best:
+                print(f"✅ Extracted order number: {best['number']} "
+                      f"(stage {best['stage']}, score {best['score']}, {best['calls']} OCR calls)")
+                return best['number']
             else:
                 print("❌ Could not extract order number")
                 return None
@@ -191,60 +173,70 @@ class IntegratedOrderProcessor:
         ]
         
         try:
+            list_before = self.waiter.snapshot(self.LIST_REGION)  # With the order window still open
+            
             # Step 1: Click on first coordinate
             print(f"  1. Clicking at ({coordinates[0]['x']}, {coordinates[0]['y']})")
-            pyautogui.click(coordinates[0]['x'], coordinates[0]['y'])
-            time.sleep(5)
+            before = self.waiter.snapshot(self.DELETE_FIELD_REGION)
+            self.backend.click(coordinates[0]['x'], coordinates[0]['y'])
+            if not self.waiter.wait_for_change('delete_open', self.DELETE_FIELD_REGION, before, timeout=5):
+                print("❌ Delete field did not open - stopping before any keystrokes")
+                return False
             
+            # Steps 2-4 only go out once the field is open; the backend pause paces them
             # Step 2: Ctrl + A (Select All)
             print("  2. Pressing Ctrl+A (Select All)")
-            pyautogui.hotkey('ctrl', 'a')
-            time.sleep(0.2)
+            self.backend.hotkey('ctrl', 'a')
             
             # Step 3: Delete
             print("  3. Pressing Delete")
-            pyautogui.press('delete')
-            time.sleep(0.2)
+            self.backend.press('delete')
             
             # Step 4: Tab
             print("  4. Pressing Tab")
-            pyautogui.press('tab')
-            time.sleep(0.2)
+            self.backend.press('tab')
             
             # Step 5: Enter
             print("  5. Pressing Enter")
-            pyautogui.press('enter')
-            time.sleep(0.3)
+            before = self.waiter.snapshot(self.CONFIRM_REGION)
+            self.backend.press('enter')
+            if not self.waiter.wait_for_change('delete_confirm_dialog', self.CONFIRM_REGION, before, timeout=2):
+                print("❌ Confirmation button did not appear - stopping")
+                return False
             
             # Step 6: Click on second coordinate
             print(f"  6. Clicking at ({coordinates[1]['x']}, {coordinates[1]['y']})")
-            pyautogui.click(coordinates[1]['x'], coordinates[1]['y'])
-            time.sleep(0.3)
+            before = self.waiter.snapshot(self.CONFIRM_REGION)
+            self.backend.click(coordinates[1]['x'], coordinates[1]['y'])
+            if not self.waiter.wait_for_change('delete_confirm', self.CONFIRM_REGION, before, timeout=2):
+                print("❌ Confirmation click had no effect - stopping")
+                return False
             
             # Step 7: Tab (after second click)
             print("  7. Pressing Tab (after second click)")
-            pyautogui.press('tab')
-            time.sleep(0.2)
+            self.backend.press('tab')
             
             # Step 8: Enter (after second click)
             print("  8. Pressing Enter (after second click)")
-            pyautogui.press('enter')
-            time.sleep(0.3)
+            self.backend.press('enter')
             
             # Step 9: Move mouse randomly
             print("  9. Moving mouse slightly...")
-            current_x, current_y = pyautogui.position()
+            current_x, current_y = self.backend.position()
             
             offset_x = random.randint(-50, 50)
             offset_y = random.randint(-50, 50)
             
-            new_x = max(50, min(current_x + offset_x, pyautogui.size()[0] - 50))
-            new_y = max(50, min(current_y + offset_y, pyautogui.size()[1] - 50))
+            new_x = max(50, min(current_x + offset_x, self.backend.size()[0] - 50))
+            new_y = max(50, min(current_y + offset_y, self.backend.size()[1] - 50))
             
-            pyautogui.moveTo(new_x, new_y, duration=0.5)
+            self.backend.move_to(new_x, new_y, duration=0.5)
             
+            # Wait for the window to close and the row to go, not just for a still frame
+            if not self.waiter.wait_for_change('delete_settle', self.LIST_REGION, list_before, timeout=2):
+                print("❌ Order list did not change after the delete")
+                return False
             print("✅ Delete sequence completed!")
-            time.sleep(1)  # Wait for deletion to process
             return True
             
         except Exception as e:
@@ -304,67 +296,42 @@ class IntegratedOrderProcessor:
         return orders_list
     
     def click_and_screenshot(self):
-        """Click at saved coordinates and take screenshot"""
+        """Click at saved coordinates and take screenshot; the path is None unless the frame was saved"""
         click_coords = (641, 759)
-        screenshot_points = [(629, 171), (716, 172), (627, 820), (774, 816)]
         
-        pyautogui.click(click_coords[0], click_coords[1])
+        self.backend.click(click_coords[0], click_coords[1])
         print(f"Clicked at ({click_coords[0]}, {click_coords[1]})")
-        pyautogui.sleep(1)
-        
-        x_coords = [p[0] for p in screenshot_points]
-        y_coords = [p[1] for p in screenshot_points]
-        
-        left = min(x_coords)
-        top = min(y_coords)
-        right = max(x_coords)
-        bottom = max(y_coords)
-        
-        width = right - left
-        height = bottom - top
+        self.waiter.wait_for_stable('list_settle', self.LIST_REGION, timeout=1)
         
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"integrated_orders_{timestamp}.png"
+        # The wait's last poll is the settled list, so it doubles as the frame
+        screenshot, fresh = self.capture.capture(self.waiter.last_image(self.LIST_REGION))
+        filepath = self.capture.last_path
+        if not fresh:
+            print("List unchanged - reusing the last screenshot")
+        elif filepath:
+            print(f"Screenshot queued: {filepath}")
         
-        filepath = os.path.join(self.shots_folder, filename)
-        screenshot.save(filepath)
-        print(f"Screenshot saved: {filepath}")
-        
-        self.screenshot_offset = (left, top)
+        self.screenshot_offset = self.LIST_REGION[:2]
         return screenshot, filepath
     
+    def save_failure_frame(self, screenshot, reason):
+        """Keep the frame a step failed on, for debugging"""
+        filepath = self.capture.save(screenshot, reason)
+        print(f"Screenshot queued: {filepath}" if filepath else "⚠️ Archive queue full - screenshot dropped")
+    
+    def analyze_frame(self, screenshot):
+        """OCR a captured list frame once; repeat calls for the same screenshot reuse the result"""
+        if screenshot is not self.frame_screenshot:
+            # Frames from the capture are hashed already; the OCR cache is keyed by the same digest
+            digest = self.capture.frame_digest if screenshot is self.capture.frame else None
+            self.frame = self.ocr_cache.analyze(screenshot, self.screenshot_offset, digest)
+            self.frame_screenshot = screenshot
+            self.frames_analyzed += 1
+        return self.frame
+    
     def extract_all_orders(self, screenshot):
         """Extract all order IDs from screenshot including selected orders"""
-        img = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        
-        # Standard OCR
-        scaled = cv2.resize(gray, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
-        denoised = cv2.fastNlMeansDenoising(scaled)
-        _, thresh = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        
-        custom_config = r'--oem 3 --psm 6 -c tessedit_char_whitelist=0123456789'
-        text = pytesseract.image_to_string(thresh, config=custom_config)
-        
-        orders = []
-        lines = text.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if line and len(re.findall(r'\d', line)) >= 8:
-                order_matches = re.findall(r'\d{8,}', line)
-                for order in order_matches:
-                    if order not in orders:
-                        orders.append(order)
-        
-        # Blue order detection
-        selected_orders = self.extract_selected_orders(img)
-        for selected_order in selected_orders:
-            if selected_order not in orders:
-                orders.append(selected_order)
-        
-        return orders
+        return self.analyze_frame(screenshot).order_ids()
     
     def extract_selected_orders(self, img):
         """Extract orders from blue highlighted/selected rows"""
@@ -377,20 +344,28 @@ class IntegratedOrderProcessor:
         
         contours, _ = cv2.findContours(blue_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
+        regions = []
         for contour in contours:
             x, y, w, h = cv2.boundingRect(contour)
             
             if w < 50 or h < 15:
                 continue
             
-            blue_region = img[y:y+h, x:x+w]
-            gray_region = cv2.cvtColor(blue_region, cv2.COLOR_BGR2GRAY)
-            inverted = cv2.bitwise_not(gray_region)
-            scaled_inverted = cv2.resize(inverted, None, fx=3, fy=3, interpolation=cv2.INTER_CUBIC)
-            
-            custom_config = r'--oem 3 --psm 7 -c tessedit_char_whitelist=0123456789'
-            selected_text = pytesseract.image_to_string(scaled_inverted, config=custom_config).strip()
-            
+            # Adjacent selected rows merge into one blue contour; read them a row at a time
+            rows = max(1, round(h / ROW_HEIGHT))
+            for row in range(rows):
+                top, bottom = y + row * h // rows, y + (row + 1) * h // rows
+                blue_region = img[top:bottom, x:x+w]
+                gray_region = cv2.cvtColor(blue_region, cv2.COLOR_BGR2GRAY)
+                inverted = cv2.bitwise_not(gray_region)
+                regions.append(cv2.resize(inverted, None, fx=3, fy=3, interpolation=cv2.INTER_CUBIC))
+        
+        # One recognition per highlighted row, run concurrently; texts come back in contour order
+        custom_config = r'--oem 3 --psm 7 -c tessedit_char_whitelist=0123456789'
+        texts = self.ocr_pool.image_to_string_many([(region, custom_config) for region in regions])
+        
+        for selected_text in texts:
+            selected_text = (selected_text or '').strip()
             if selected_text and len(re.findall(r'\d', selected_text)) >= 8:
                 order_matches = re.findall(r'\d{8,}', selected_text)
                 for order in order_matches:
@@ -401,40 +376,7 @@ class IntegratedOrderProcessor:
     
     def find_order_location(self, screenshot, target_order_id):
         """Find the location of a specific order ID in the screenshot"""
-        img = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        
-        scaled = cv2.resize(gray, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
-        denoised = cv2.fastNlMeansDenoising(scaled)
-        _, thresh = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        
-        custom_config = r'--oem 3 --psm 6 -c tessedit_char_whitelist=0123456789'
-        data = pytesseract.image_to_data(thresh, config=custom_config, output_type=pytesseract.Output.DICT)
-        
-        found_orders = []
-        
-        for i in range(len(data['text'])):
-            text = data['text'][i].strip()
-            if len(text) >= 8:
-                if target_order_id in text:
-                    x = int(data['left'][i] / 2)
-                    y = int(data['top'][i] / 2)
-                    w = int(data['width'][i] / 2)
-                    h = int(data['height'][i] / 2)
-                    
-                    screen_x = x + self.screenshot_offset[0]
-                    screen_y = y + self.screenshot_offset[1]
-                    
-                    found_orders.append({
-                        'text': text,
-                        'screen_x': screen_x,
-                        'screen_y': screen_y,
-                        'width': w,
-                        'height': h,
-                        'confidence': data['conf'][i]
-                    })
-        
-        return found_orders
+        return self.analyze_frame(screenshot).locate(target_order_id)
     
     def double_click_order(self, order_location, click_offset_x=50):
         """Double click BESIDE the order (not on the order number)"""
@@ -446,8 +388,9 @@ class IntegratedOrderProcessor:
         click_y = order_location['screen_y'] + (order_location['height'] // 2)
         
         print(f"  🖱️ Double-clicking BESIDE order at ({click_x}, {click_y}) [offset: -{click_offset_x}px]")
-        pyautogui.doubleClick(click_x, click_y)
-        time.sleep(2)  # Wait for order to open
+        before = self.waiter.snapshot(self.ORDER_NUMBER_REGION)
+        self.backend.double_click(click_x, click_y)
+        self.waiter.wait_for_change('open_order', self.ORDER_NUMBER_REGION, before, timeout=2)  # Wait for order to open
         
         return True
     
@@ -467,15 +410,109 @@ class IntegratedOrderProcessor:
             print(f"❌ No match: {clicked_order} ≠ {detected_order}")
             return False
     
-    def process_single_order(self, target_order, screenshot):
-        """Process a single order through the complete workflow"""
+    def select_orders(self, locations):
+        """Select the rows beside the given locations: a click for the first, Ctrl-clicks after"""
+        before = self.waiter.snapshot(self.LIST_REGION)
+        for i, location in enumerate(locations):
+            click_x = location['screen_x'] - 50  # Same offset as double_click_order
+            click_y = location['screen_y'] + (location['height'] // 2)
+            if i == 0:
+                self.backend.click(click_x, click_y)
+            else:
+                self.backend.ctrl_click(click_x, click_y)
+        self.waiter.wait_for_change('batch_select', self.LIST_REGION, before, timeout=1)
+    
+    def run_batch_delete_sequence(self):
+        """Delete the selected rows: Delete key, then the confirmation button"""
+        confirm_x, confirm_y = 1331, 832
+        
+        before = self.waiter.snapshot(self.CONFIRM_REGION)
+        self.backend.press('delete')
+        if not self.waiter.wait_for_change('batch_confirm_dialog', self.CONFIRM_REGION, before, timeout=2):
+            print("❌ Delete confirmation did not appear")
+            return False
+        
+        before = self.waiter.snapshot(self.LIST_REGION)
+        self.backend.click(confirm_x, confirm_y)
+        if not self.waiter.wait_for_change('batch_delete_settle', self.LIST_REGION, before, timeout=2):
+            print("❌ Order list did not change after the batch delete")
+            return False
+        return True
+    
+    def process_batch(self, target_orders, screenshot):
+        """
+        Select every target order in the current view (target -> id as read), check the
+        highlighted rows read back as exactly those orders, then delete them with one
+        confirmation. Returns how many orders were deleted; 0 leaves them to
+        process_single_order.
+        """
+        # Only exact reads are batched. A near-miss may be a neighbouring order, so it goes
+        # through process_single_order, where the order window is checked before deleting.
+        target_orders = {target_order: read_order for target_order, read_order in target_orders.items()
+                         if normalize_order_id(read_order) == target_order}
+        if not target_orders:
+            return 0
+        
+        print(f"\n📦 Batch processing {len(target_orders)} orders in view")
+        print("-" * 50)
+        
+        locations = {}
+        for target_order, read_order in target_orders.items():
+            found_orders = self.find_order_location(screenshot, read_order)
+            if found_orders:
+                locations[target_order] = max(found_orders, key=lambda x: x['confidence'])
+        if not locations:
+            return 0
+        
+        # Step 1: Select every target row
+        print(f"1️⃣ Selecting {len(locations)} rows...")
+        self.select_orders(list(locations.values()))
+        
+        # Step 2: Verify the selection by reading the highlighted rows back
+        print("2️⃣ Verifying selection...")
+        capture = self.backend.screenshot(region=self.LIST_REGION)
+        selected_reads = self.extract_selected_orders(cv2.cvtColor(np.array(capture), cv2.COLOR_RGB2BGR))
+        selected = {normalize_order_id(read) for read in selected_reads}
+        clicked = {normalize_order_id(target_orders[target_order]) for target_order in locations}
+        if selected != clicked:
+            print(f"❌ Selection mismatch - expected {sorted(clicked)}, highlighted {sorted(selected)}")
+            self.save_failure_frame(capture, 'selection_mismatch')
+            return 0
+        print(f"✅ Selection verified: {len(selected)} orders")
+        
+        # Step 3: Delete the whole selection
+        print("3️⃣ Deleting selection...")
+        if not self.run_batch_delete_sequence():
+            return 0
+        
+        self.processed_orders.update(locations)
+        for target_order in locations:
+            self.targets.remove(target_order)
+        self.batch_sizes.append(len(locations))
+        print(f"✅ Batch deleted {len(locations)} orders")
+        return len(locations)
+    
+    def throughput(self):
+        """Processed orders per minute of backend time since the workflow started"""
+        elapsed = self.backend.now() - self.workflow_started if self.workflow_started is not None else 0.0
+        return {
+            'mode': 'batch' if self.batch_delete else 'single',
+            'elapsed_s': round(elapsed, 1),
+            'orders_per_minute': round(len(self.processed_orders) / elapsed * 60, 2) if elapsed > 0 else 0.0,
+            'batches': len(self.batch_sizes),
+            'batch_sizes': self.batch_sizes
+        }
+    
+    def process_single_order(self, target_order, screenshot, read_order=None):
+        """Process a single order through the complete workflow; read_order is the id as OCR'd"""
         print(f"\n🎯 Processing order: {target_order}")
         print("-" * 50)
         
         # Find order location
-        found_orders = self.find_order_location(screenshot, target_order)
+        found_orders = self.find_order_location(screenshot, read_order or target_order)
         if not found_orders:
             print(f"❌ Order {target_order} not found in current view")
+            self.save_failure_frame(screenshot, 'not_found')
             return False
         
         best_match = max(found_orders, key=lambda x: x['confidence'])
@@ -487,6 +524,8 @@ class IntegratedOrderProcessor:
             print("❌ Failed to double-click order")
             return False
         
+        self.opened_orders.add(target_order)
+        
         # Step 2: Extract order number from opened interface
         print("2️⃣ Extracting order number from interface...")
         detected_order = self.extract_order_number_from_interface()
@@ -495,9 +534,10 @@ class IntegratedOrderProcessor:
         print("3️⃣ Verifying order match...")
         if not self.verify_order_match(target_order, detected_order):
             print(f"❌ Order mismatch - skipping deletion")
-            # Close the order interface (press Escape)
-            pyautogui.press('escape')
-            time.sleep(1)
+            if read_order and normalize_order_id(read_order) != target_order:
+                self.targets.reject(read_order)  # A neighbouring order, not a misread target
+            self.save_failure_frame(screenshot, 'mismatch')
+            self.close_order_window()
             return False
         
         # Step 4: Run delete sequence
@@ -505,11 +545,19 @@ class IntegratedOrderProcessor:
         if self.run_delete_sequence():
             print(f"✅ Successfully processed order: {target_order}")
             self.processed_orders.add(target_order)
+            self.targets.remove(target_order)
             return True
         else:
             print(f"❌ Failed to delete order: {target_order}")
+            self.close_order_window()  # A stopped sequence leaves it open over the list
             return False
     
+    def close_order_window(self):
+        """Close the order interface (press Escape)"""
+        before = self.waiter.snapshot(self.ORDER_NUMBER_REGION)
+        self.backend.press('escape')
+        self.waiter.wait_for_change('close_order', self.ORDER_NUMBER_REGION, before, timeout=1)
+    
     def integrated_workflow(self):
         """Main integrated workflow"""
         print("🚀 INTEGRATED ORDER PROCESSING WORKFLOW")
@@ -527,6 +575,12 @@ class IntegratedOrderProcessor:
             return False
         
         print(f"\n🎯 Starting integrated processing for {len(self.target_orders)} orders...")
+        self.targets = TargetIndex(self.target_orders)
+        self.workflow_started = self.backend.now()
+        
+        if self.sweep_first:
+            index = self.sweep_list()
+            return self.delete_indexed_targets(index)
         
         search_attempt = 0
         previous_orders = None
@@ -536,8 +590,7 @@ class IntegratedOrderProcessor:
             print(f"\n🔄 Search Attempt {search_attempt}")
             
             # Check if all orders are processed
-            remaining_orders = [order for order in self.target_orders if order not in self.processed_orders]
-            if not remaining_orders:
+            if not len(self.targets):
                 print(f"\n🎉 ALL ORDERS PROCESSED!")
                 print(f"Successfully processed all {len(self.processed_orders)} orders!")
                 return True
@@ -546,48 +599,59 @@ class IntegratedOrderProcessor:
             screenshot, img_filepath = self.click_and_screenshot()
             current_orders = self.extract_all_orders(screenshot)
             self.search_history.append(current_orders)
+            self.scroll.observe(self.analyze_frame(screenshot))
             
             print(f"📋 Current view has {len(current_orders)} orders")
-            print(f"🎯 Remaining targets: {len(remaining_orders)}")
+            print(f"🎯 Remaining targets: {len(self.targets)}")
             
-            # Process orders found in current view
+            # Process orders found in current view: one index lookup per visible row
+            targets_in_view = self.targets.match_frame(current_orders)
             orders_processed_this_round = 0
-            for target_order in remaining_orders:
-                if any(target_order in current_order for current_order in current_orders):
-                    if self.process_single_order(target_order, screenshot):
+            if self.batch_delete and targets_in_view:
+                orders_processed_this_round = self.process_batch(targets_in_view, screenshot)
+            
+            # One at a time, also when a batch could not be verified
+            if not orders_processed_this_round:
+                for target_order, read_order in targets_in_view.items():
+                    if self.process_single_order(target_order, screenshot, read_order):
                         orders_processed_this_round += 1
-                        # Take new screenshot after processing
+                        # Take new screenshot after processing (waits for the list to settle)
                         screenshot, _ = self.click_and_screenshot()
-                        time.sleep(1)
             
             if orders_processed_this_round > 0:
                 print(f"\n📊 Processed {orders_processed_this_round} orders this round")
                 continue  # Start fresh after processing orders
             
-            # Check if reached top of list
-            if previous_orders and set(current_orders) == set(previous_orders):
+            # Check if reached top of list (a jump that hit an end of the list just re-plans)
+            if (previous_orders and set(current_orders) == set(previous_orders)
+                    and self.scroll.plan(self.targets.targets) is None):
                 remaining = len(self.target_orders) - len(self.processed_orders)
                 print(f"\n📊 WORKFLOW COMPLETED!")
                 print(f"Processed: {len(self.processed_orders)}/{len(self.target_orders)} orders")
                 
                 if remaining > 0:
                     print(f"❌ {remaining} orders not found:")
-                    for order in remaining_orders[:10]:
+                    for order in sorted(self.targets.targets)[:10]:
                         print(f"  • {order}")
                 
                 return remaining == 0
             
             # Navigate up to find more orders
             print("⬆️ Navigating up to find more orders...")
-            self.navigate_up_intelligently(current_orders, previous_orders)
+            self.navigate_up_intelligently(current_orders, previous_orders, screenshot)
             previous_orders = current_orders.copy()
-            time.sleep(0.5)
     
-    def navigate_up_intelligently(self, current_orders, previous_orders):
+    def navigate_up_intelligently(self, current_orders, previous_orders, screenshot=None):
         """Navigate up intelligently - first select top order, then scroll"""
         
-        # Calculate smart number of moves
-        if not current_orders:
+        # Jump straight towards the nearest target when the scroll model can place it
+        plan = self.scroll.plan(self.targets.targets)
+        keys = plan['keys'] if plan else None
+        
+        # Otherwise calculate smart number of moves
+        if keys:
+            moves = 0
+        elif not current_orders:
             moves = 15
         elif not previous_orders:
             moves = 10
@@ -610,11 +674,34 @@ class IntegratedOrderProcessor:
             print(f"  Total current: {len(current_orders)}")
         
         # Step 1: First select the top order (click beside it to select)
+        self.select_top_order(current_orders, screenshot)
+        
+        # Step 2: Now navigate using the planned jump, or up arrow keys
+        before = self.waiter.snapshot(self.LIST_REGION)
+        if keys:
+            print(f"🦘 Jumping to target {plan['target']} (~{abs(plan['rows'])} rows "
+                  f"{'up' if plan['rows'] < 0 else 'down'}): {', '.join(f'{key} x{presses}' for key, presses in keys)}")
+            self.press_keys(keys)
+            self.scroll.record(plan)
+        else:
+            print(f"⬆️ Moving up {moves} positions...")
+            for i in range(moves):
+                self.backend.press('up')
+                if i % 5 == 4:  # Show progress every 5 moves
+                    print(f"  Progress: {i+1}/{moves} moves completed")
+            
+            print(f"✓ Completed {moves} UP movements")
+        # Wait for the view to move; it only stays put at the top of the list
+        self.waiter.wait_for_change('navigate_settle', self.LIST_REGION, before, timeout=1)
+    
+    def select_top_order(self, current_orders, screenshot=None):
+        """Click beside the top order so arrow and page keys move from the top of the view"""
         if current_orders:
             print(f"🎯 Selecting top order for navigation...")
             
-            # Take a fresh screenshot to find top order location
-            screenshot, _ = self.click_and_screenshot()
+            # Reuse the frame current_orders came from; only capture again when none was passed
+            if screenshot is None:
+                screenshot, _ = self.click_and_screenshot()
             top_order = current_orders[0]
             found_orders = self.find_order_location(screenshot, top_order)
             
@@ -625,31 +712,156 @@ class IntegratedOrderProcessor:
                 click_y = top_order_location['screen_y'] + (top_order_location['height'] // 2)
                 
                 print(f"  Clicking beside top order {top_order} at ({click_x}, {click_y}) to select it")
-                pyautogui.click(click_x, click_y)
-                pyautogui.sleep(0.5)
+                before = self.waiter.snapshot(self.LIST_REGION)
+                self.backend.click(click_x, click_y)
+                self.waiter.wait_for_change('select_top_order', self.LIST_REGION, before, timeout=0.5)
             else:
                 print(f"  Could not locate top order {top_order} - using direct navigation")
+    
+    def press_keys(self, keys):
+        for key, presses in keys:
+            for _ in range(presses):
+                self.backend.press(key)
+    
+    def sweep_list(self):
+        """Phase 1: page through the whole list once from the top, indexing every order id by row"""
+        print("\n🧹 Sweeping the order list...")
+        index = SweepIndex()
+        
+        self.click_and_screenshot()  # Focus the list
+        before = self.waiter.snapshot(self.LIST_REGION)
+        self.backend.press('home')
+        self.waiter.wait_for_change('sweep_home', self.LIST_REGION, before, timeout=1)
+        
+        previous_top = None
+        pages = 0
+        while True:
+            screenshot, _ = self.click_and_screenshot()
+            frame = self.analyze_frame(screenshot)
+            rows = frame_rows(frame)
+            if not rows or rows[0][1] == previous_top:
+                break  # Paging down no longer moves the view: end of the list
+            previous_top = rows[0][1]
+            
+            new = index.add_frame(frame)
+            self.scroll.observe(frame)
+            pages += 1
+            print(f"  Page {pages}: {len(rows)} orders, {new} new, {len(index)} indexed")
+            
+            # The end of the list is only decided from a frame taken after the page had its chance to move
+            before = self.waiter.snapshot(self.LIST_REGION)
+            self.backend.press('pagedown')
+            self.waiter.wait_for_change('sweep_page', self.LIST_REGION, before, timeout=1)
+        
+        self.sweep_stats = {'pages': pages, 'indexed_orders': len(index), 'sweep_frames': self.frames_analyzed}
+        print(f"✓ Sweep done: {len(index)} orders on {pages} pages")
+        return index
+    
+    def delete_indexed_targets(self, index):
+        """
+        Phase 2: visit the targets the sweep found, nearest first, jumping by their exact
+        row offsets. Deleted rows are removed from the index so the rows below shift up.
+        """
+        located = self.targets.match_frame(index.order_ids())  # Target -> id as indexed
+        print(f"\n🗂️ {len(located)} of {len(self.targets)} targets are in the list")
+        failed = set()
+        attempts = {}
         
-        # Step 2: Now navigate up using arrow keys
-        print(f"⬆️ Moving up {moves} positions...")
-        for i in range(moves):
-            pyautogui.press('up')
-            if i % 5 == 4:  # Show progress every 5 moves
-                print(f"  Progress: {i+1}/{moves} moves completed")
-            time.sleep(0.1)
-        
-        print(f"✓ Completed {moves} UP movements")
-        time.sleep(1)  # Wait for UI to settle
+        while True:
+            pending = {target: read for target, read in located.items()
+                       if target in self.targets and target not in failed}
+            if not pending:
+                break
+            
+            screenshot, _ = self.click_and_screenshot()
+            frame = self.analyze_frame(screenshot)
+            current_orders = frame.order_ids()
+            top = index.anchor(frame)
+            if top is None:
+                print("❌ Lost track of the list position - stopping")
+                self.save_failure_frame(screenshot, 'lost_position')
+                break
+            
+            # A target is in view when its indexed id is read exactly, or when its own row reads as a near miss of it
+            visible = {normalize_order_id(order) for order in current_orders}
+            row_reads = dict(frame_rows(frame))
+            in_view = {}
+            for target, read in pending.items():
+                if normalize_order_id(read) in visible:
+                    in_view[target] = read
+                else:
+                    row_read = row_reads.get(index.row_now(read) - top)
+                    if row_read is not None and self.targets.match(row_read) == target:
+                        in_view[target] = row_read
+            if in_view:
+                if self.batch_delete:
+                    self.process_batch(in_view, screenshot)
+                if not self.batch_delete or all(target in self.targets for target in in_view):
+                    for target_order, read_order in in_view.items():
+                        if self.process_single_order(target_order, screenshot, read_order):
+                            screenshot, _ = self.click_and_screenshot()
+                
+                for target_order in in_view:
+                    if target_order not in self.targets:
+                        index.remove(pending[target_order])
+                    elif target_order in self.opened_orders:
+                        failed.add(target_order)  # Its own row was opened but not deleted; don't come back for it
+                    else:
+                        attempts[target_order] = attempts.get(target_order, 0) + 1
+                        if attempts[target_order] > 3:
+                            print(f"❌ Order {target_order} could not be opened - skipping")
+                            failed.add(target_order)
+                continue
+            
+            # Jump to the nearest pending target by its exact row offset
+            target, read = min(pending.items(), key=lambda item: abs(index.row_now(item[1]) - top))
+            rows = index.row_now(read) - top
+            attempts[target] = attempts.get(target, 0) + 1
+            if 0 <= rows < self.visible_rows or attempts[target] > 3:
+                print(f"❌ Order {target} should be in view but wasn't read - skipping")
+                failed.add(target)
+                continue
+            
+            keys = jump_keys(rows, self.visible_rows)
+            print(f"🦘 Jumping {abs(rows)} rows {'up' if rows < 0 else 'down'} to {target}: "
+                  f"{', '.join(f'{key} x{presses}' for key, presses in keys)}")
+            self.select_top_order(current_orders, screenshot)
+            before = self.waiter.snapshot(self.LIST_REGION)
+            self.press_keys(keys)
+            self.scroll.record({'rows': rows, 'keys': keys})
+            self.waiter.wait_for_change('navigate_settle', self.LIST_REGION, before, timeout=1)
+        
+        print(f"\n📊 Processed: {len(self.processed_orders)}/{len(self.target_orders)} orders")
+        if len(self.targets):
+            print(f"❌ {len(self.targets)} orders not deleted:")
+            for order in sorted(self.targets.targets)[:10]:
+                print(f"  • {order}")
+        return len(self.targets) == 0
     
     def save_results(self):
         """Save processing results"""
+        self.archive.flush()  # So the archive counts are final
         results = {
             'timestamp': datetime.now().isoformat(),
             'total_target_orders': len(self.target_orders),
             'processed_orders': len(self.processed_orders),
             'success_rate': len(self.processed_orders) / len(self.target_orders) * 100 if self.target_orders else 0,
             'processed_order_ids': list(self.processed_orders),
-            'remaining_orders': [order for order in self.target_orders if order not in self.processed_orders]
+            'remaining_orders': [order for order in self.target_orders if order not in self.processed_orders],
+            'frames_analyzed': self.frames_analyzed,
+            'capture': self.capture.stats(),
+            'archive': self.archive.stats(),
+            'ocr_cache': self.ocr_cache.stats(),
+            'row_ocr': self.row_reader.stats(),
+            'ocr_engine': self.ocr_engine.name,
+            'ocr_pool': self.ocr_pool.stats(),
+            'order_number_stages': self.order_number_extractor.stats(),
+            'throughput': self.throughput(),
+            'target_matching': self.targets.stats(),
+            'sweep': self.sweep_stats,
+            'navigation': dict(self.scroll.stats(),
+                               frames_per_found_order=round(self.frames_analyzed / max(len(self.processed_orders), 1), 2)),
+            'step_latency': self.waiter.recorder.summary()
         }
         
         filename = f"integrated_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -688,6 +900,10 @@ def main():
         print(f"\n❌ Error occurred: {e}")
         processor.save_results()
     
+    finally:
+        processor.ocr_pool.close()
+        processor.archive.close()
+    
     print(f"\n👋 Integrated processing session ended.")
 
 if __name__ == "__main__":
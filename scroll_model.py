@@ -0,0 +1,208 @@
+import bisect
+import math
+from collections import defaultdict
+
+from order_ocr import ROW_HEIGHT
+
+
+def jump_keys(rows, visible_rows, max_moves=None):
+    """
+    Keys (name, presses) that move the selection from the top row of the view to a
+    row this many rows away (negative is up), overshooting by half a view so the row
+    lands mid-screen. max_moves caps the rows moved, for jumps on an estimate.
+    """
+    moves = math.ceil(abs(rows)) + visible_rows // 2
+    if max_moves is not None:
+        moves = min(moves, max_moves)
+    pages, rest = divmod(moves, visible_rows)
+    page_key, row_key = ('pageup', 'up') if rows < 0 else ('pagedown', 'down')
+    return [(key, presses) for key, presses in ((page_key, pages), (row_key, rest)) if presses]
+
+
+def frame_rows(frame, row_height=ROW_HEIGHT):
+    """(row within the view, order id) for every id in a FrameAnalysis, top to bottom"""
+    return sorted(((word['top'] + word['height'] // 2) // row_height, order)
+                  for word in frame.words for order in word['order_ids'])
+
+
+class ScrollModel:
+    """
+    Where the order list is scrolled to, learned from the frames read so far. Order
+    ids grow steadily down the list, so the ids seen per row of screen give a rate
+    for estimating how many rows away any target id is. plan() turns that estimate
+    into PageUp/PageDown and arrow presses that should bring the nearest target into
+    the middle of the view. The estimate can be far off where ids jump, so a jump
+    moves at most one page, and a target is given up after max_jumps jumps towards
+    it or after a jump towards it that didn't move the view.
+    """
+
+    def __init__(self, visible_rows, row_height=ROW_HEIGHT, max_jumps=25):
+        self.visible_rows = visible_rows
+        self.row_height = row_height
+        self.max_jumps = max_jumps
+        self.id_span = 0.0        # Summed id change across observed frames...
+        self.row_span = 0.0       # ...and the rows it took, for the ids-per-row rate
+        self.top_id = None        # Id in the top row of the latest frame
+        self.seen = []            # Sorted, merged [low, high] id ranges covered by frames
+        self.first_id = None      # Ids at the list's top and bottom, once a jump has hit them
+        self.last_id = None
+        self.jump = None          # (direction, top id before, target) of the last jump, until the next frame
+        self.jumps = 0
+        self.target_jumps = defaultdict(int)
+        self.unreachable = set()  # Targets given up on
+        self.keys = defaultdict(int)
+
+    def observe(self, frame):
+        """Update the model from a FrameAnalysis of the list"""
+        rows = sorted((word['top'], int(order)) for word in frame.words for order in word['order_ids'])
+        if len(rows) < 2:
+            return
+
+        (first_y, first_id), (last_y, last_id) = rows[0], rows[-1]
+        row_count = (last_y - first_y) / self.row_height
+        if row_count >= 1:
+            self.id_span += last_id - first_id
+            self.row_span += row_count
+        ids = [order for _, order in rows]
+        if self.jump is not None:
+            direction, top_before, target = self.jump
+            if first_id == top_before:
+                # The view didn't move, so the jump ran into the end of the list
+                if direction == 'up':
+                    self.first_id = min(ids)
+                else:
+                    self.last_id = max(ids)
+                if target is not None:
+                    self.unreachable.add(target)
+            self.jump = None
+        self.top_id = first_id
+        self.add_seen(min(ids), max(ids))
+
+    def add_seen(self, low, high):
+        i = bisect.bisect_left(self.seen, [low, low])
+        if i > 0 and self.seen[i - 1][1] >= low:
+            i -= 1
+        j = i
+        while j < len(self.seen) and self.seen[j][0] <= high:
+            low, high = min(low, self.seen[j][0]), max(high, self.seen[j][1])
+            j += 1
+        self.seen[i:j] = [[low, high]]
+
+    def was_seen(self, order_id):
+        """True when a frame already covered this id, so a target there wasn't in the list"""
+        i = bisect.bisect_right(self.seen, [order_id, math.inf]) - 1
+        return i >= 0 and self.seen[i][0] <= order_id <= self.seen[i][1]
+
+    def reachable(self, order_id):
+        """Not given up on, not passed over by a frame and not beyond a known end of the list"""
+        if order_id in self.unreachable:
+            return False
+        if self.first_id is not None and order_id < self.first_id:
+            return False
+        if self.last_id is not None and order_id > self.last_id:
+            return False
+        return not self.was_seen(order_id)
+
+    @property
+    def ids_per_row(self):
+        if self.row_span == 0 or self.id_span == 0:
+            return None
+        return self.id_span / self.row_span
+
+    def plan(self, targets):
+        """
+        Keys (name, presses) from the top row of the current view to the nearest
+        target not already passed, or None when the model can't tell yet.
+        """
+        rate = self.ids_per_row
+        if rate is None or self.top_id is None:
+            return None
+
+        nearest = None
+        for target in targets:
+            target = int(target)
+            if not self.reachable(target):
+                continue
+            rows = (target - self.top_id) / rate
+            if nearest is None or abs(rows) < abs(nearest[1]):
+                nearest = (target, rows)
+        if nearest is None:
+            return None
+
+        target, rows = nearest
+        keys = jump_keys(rows, self.visible_rows, max_moves=self.visible_rows)
+        return {'target': str(target), 'rows': round(rows, 1), 'keys': keys}
+
+    def record(self, plan):
+        keys = plan['keys']
+        target = int(plan['target']) if plan.get('target') else None
+        self.jump = ('up' if plan['rows'] < 0 else 'down', self.top_id, target)
+        self.jumps += 1
+        if target is not None:
+            self.target_jumps[target] += 1
+            if self.target_jumps[target] >= self.max_jumps:
+                self.unreachable.add(target)
+        for key, presses in keys:
+            self.keys[key] += presses
+
+    def stats(self):
+        return {
+            'ids_per_row': round(self.ids_per_row, 1) if self.ids_per_row else None,
+            'jumps': self.jumps,
+            'keys': dict(self.keys),
+            'seen_ranges': len(self.seen),
+            'unreachable_targets': len(self.unreachable)
+        }
+
+
+class SweepIndex:
+    """
+    Row of every order id in the list, built by one sweep through it. Each page is
+    placed by an id it shares with an already indexed page, or directly after the
+    last indexed row when pages don't overlap. Rows are kept as first indexed;
+    deletions are recorded separately and subtracted on lookup, so the rows below a
+    deleted order move up without rewriting the index.
+    """
+
+    def __init__(self, row_height=ROW_HEIGHT):
+        self.row_height = row_height
+        self.row_of = {}          # Order id -> row when indexed
+        self.removed = []         # Sorted indexed rows of orders deleted since
+
+    def row_now(self, order_id):
+        row = self.row_of[order_id]
+        return row - bisect.bisect_left(self.removed, row)
+
+    def anchor(self, frame):
+        """Current row of the view's top row, from any indexed id in the frame; None if none"""
+        for view_row, order in frame_rows(frame, self.row_height):
+            if order in self.row_of:
+                return self.row_now(order) - view_row
+        return None
+
+    def add_frame(self, frame):
+        """Index a sweep page; returns how many ids were new"""
+        rows = frame_rows(frame, self.row_height)
+        if not rows:
+            return 0
+        top = self.anchor(frame)
+        if top is None:
+            top = (max(self.row_of.values()) + 1 - rows[0][0]) if self.row_of else 0
+
+        new = 0
+        for view_row, order in rows:
+            if order not in self.row_of:
+                self.row_of[order] = top + view_row
+                new += 1
+        return new
+
+    def remove(self, order_id):
+        if order_id in self.row_of:
+            bisect.insort(self.removed, self.row_of.pop(order_id))
+
+    def order_ids(self):
+        """Indexed ids in list order"""
+        return sorted(self.row_of, key=self.row_of.get)
+
+    def __len__(self):
+        return len(self.row_of)
@@ -0,0 +1,164 @@
+import re
+from collections import defaultdict
+
+
+def normalize_order_id(order_id):
+    """Digits only, so '#123456789 ' and 123456789 compare equal"""
+    return re.sub(r'\D', '', str(order_id))
+
+
+def deletion_keys(order_id):
+    """The id itself plus every way of dropping one digit (symmetric-delete keys)"""
+    return {order_id} | {order_id[:i] + order_id[i + 1:] for i in range(len(order_id))}
+
+
+def within_one_edit(a, b):
+    """True when a and b differ by at most one substitution, insertion or deletion"""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:]
+    return a[i:] == b[i + 1:]
+
+
+def fits_sequence(reads, i):
+    """
+    True when reads[i] sits strictly between its neighbours in the frame's id order,
+    as a correctly read id of some other order would. A misread digit usually breaks
+    the order or duplicates a neighbour. One neighbour may itself be a misread, so
+    skipping either neighbour for the one beyond it also counts.
+    """
+    values = [int(read) if read else None for read in reads]
+    if values[i] is None or len(values) < 2:
+        return True  # Nothing to compare against, so it can't be ruled out as a real id
+    known = [value for value in values if value is not None]
+    direction = 1 if known[-1] >= known[0] else -1
+
+    def at(j):
+        return values[j] if 0 <= j < len(values) else None
+
+    def between(before, after):
+        if before is None and after is None:
+            return False
+        return ((before is None or before * direction < values[i] * direction)
+                and (after is None or values[i] * direction < after * direction))
+
+    if at(i - 1) is None and at(i + 1) is None:
+        return True
+    if between(at(i - 1), at(i + 1)):
+        return True
+    # Skipping a neighbour only counts when there is a read beyond it to compare with
+    return ((at(i - 2) is not None and between(at(i - 2), at(i + 1)))
+            or (at(i + 2) is not None and between(at(i - 1), at(i + 2))))
+
+
+class TargetIndex:
+    """
+    Remaining target orders for the workflow. Exact reads are a set lookup. OCR
+    near-misses (one digit misread, dropped or doubled) go through a symmetric-delete
+    index: a read and a target within one edit always share a key, so each read
+    costs O(digits) lookups however many targets remain. Order ids are close to
+    sequential, so a near-miss is as likely a neighbouring order as a misread: one
+    matching more than one target, one that fits the frame's id sequence, or one the
+    order window already showed to be another order is left unmatched.
+    """
+
+    def __init__(self, targets):
+        self.targets = set()
+        self.keys = defaultdict(set)   # Deletion key -> targets having it
+        self.exact_matches = 0
+        self.fuzzy_matches = 0
+        self.ambiguous_reads = 0
+        self.in_sequence_reads = 0     # Near-misses taken for the real id of a neighbouring order
+        self.rejected_reads = set()    # Near-misses the order window showed to be other orders
+        for target in targets:
+            self.add(target)
+
+    def add(self, target):
+        target = normalize_order_id(target)
+        self.targets.add(target)
+        for key in deletion_keys(target):
+            self.keys[key].add(target)
+
+    def remove(self, target):
+        target = normalize_order_id(target)
+        if target not in self.targets:
+            return
+        self.targets.discard(target)
+        for key in deletion_keys(target):
+            self.keys[key].discard(target)
+            if not self.keys[key]:
+                del self.keys[key]
+
+    def match(self, read):
+        """(target, 'exact' | 'fuzzy') for an OCR'd id, or None"""
+        read = normalize_order_id(read)
+        if read in self.targets:
+            return read, 'exact'
+        if read in self.rejected_reads:
+            return None
+
+        candidates = set()
+        for key in deletion_keys(read):
+            candidates |= self.keys.get(key, set())
+        # Shared keys also pair some ids two edits apart (e.g. swapped digits); check properly
+        candidates = {target for target in candidates if within_one_edit(read, target)}
+        if len(candidates) == 1:
+            return candidates.pop(), 'fuzzy'
+        if candidates:
+            self.ambiguous_reads += 1
+        return None
+
+    def match_frame(self, reads):
+        """
+        Targets visible in a frame, in frame order, mapped to the id as it was read. An
+        exact read wins over a near-miss elsewhere in the frame, which in a dense run
+        of ids is usually just the neighbouring order.
+        """
+        normalized = [normalize_order_id(read) for read in reads]
+        found = []
+        for i, read in enumerate(reads):
+            match = self.match(read)
+            if match is None:
+                continue
+            if match[1] == 'fuzzy' and fits_sequence(normalized, i):
+                self.in_sequence_reads += 1
+                continue
+            found.append((read,) + match)
+        exact = {target for _, target, kind in found if kind == 'exact'}
+        matches = {}
+        for read, target, kind in found:
+            if target in matches or (kind == 'fuzzy' and target in exact):
+                continue
+            matches[target] = read
+            if kind == 'exact':
+                self.exact_matches += 1
+            else:
+                self.fuzzy_matches += 1
+                print(f"  🔤 Fuzzy match: read {read} -> target {target}")
+        return matches
+
+    def reject(self, read):
+        """The order window showed a near-miss read to be another order; don't match it again"""
+        self.rejected_reads.add(normalize_order_id(read))
+
+    def __len__(self):
+        return len(self.targets)
+
+    def __contains__(self, target):
+        return normalize_order_id(target) in self.targets
+
+    def stats(self):
+        return {
+            'remaining': len(self.targets),
+            'exact_matches': self.exact_matches,
+            'fuzzy_matches': self.fuzzy_matches,
+            'ambiguous_reads': self.ambiguous_reads,
+            'in_sequence_reads': self.in_sequence_reads,
+            'rejected_reads': len(self.rejected_reads)
+        }
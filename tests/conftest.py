@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app builds its parsed-upload cache on import; keep it out of the working tree
+os.environ.setdefault('PARSED_CACHE_DIR', tempfile.mkdtemp(prefix='parsed-cache-'))
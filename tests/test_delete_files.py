@@ -0,0 +1,16 @@
+from app import app
+
+
+def test_delete_files_empties_shots_and_main(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'shots' / 'nested').mkdir(parents=True)
+    (tmp_path / 'main').mkdir()
+    (tmp_path / 'shots' / 'integrated_orders_1.png').write_bytes(b'png')
+    (tmp_path / 'shots' / 'nested' / 'old.png').write_bytes(b'png')
+    (tmp_path / 'main' / 'filtered_positions.json').write_text('[]')
+
+    response = app.test_client().get('/delete_files')
+
+    assert response.status_code == 302
+    assert list((tmp_path / 'shots').iterdir()) == []
+    assert list((tmp_path / 'main').iterdir()) == []
@@ -0,0 +1,54 @@
+import numpy as np
+from PIL import Image
+
+from order_ocr import FrameAnalysis, FrameOcrCache, frame_digest
+
+
+def make_frame(seed):
+    pixels = np.random.default_rng(seed).integers(0, 256, (120, 80, 3), dtype=np.uint8)
+    return Image.fromarray(pixels)
+
+
+def counting_reader():
+    calls = []
+
+    def read(screenshot, offset):
+        calls.append(screenshot)
+        return FrameAnalysis([], offset)
+    return read, calls
+
+
+def test_repeat_frame_skips_the_reader():
+    read, calls = counting_reader()
+    cache = FrameOcrCache(reader=read)
+    frame = make_frame(0)
+
+    cache.analyze(frame)
+    cache.analyze(frame.copy())
+
+    assert len(calls) == 1
+    assert cache.stats()['hits'] == 1
+
+
+def test_one_changed_pixel_is_read_again():
+    read, calls = counting_reader()
+    cache = FrameOcrCache(reader=read)
+    frame = make_frame(0)
+    changed = frame.copy()
+    changed.putpixel((5, 5), (0, 0, 0) if frame.getpixel((5, 5)) != (0, 0, 0) else (255, 255, 255))
+
+    cache.analyze(frame)
+    cache.analyze(changed)
+
+    assert len(calls) == 2
+
+
+def test_given_digest_is_the_cache_key():
+    read, calls = counting_reader()
+    cache = FrameOcrCache(reader=read)
+    frame = make_frame(1)
+
+    cache.analyze(frame, digest=frame_digest(frame))
+    cache.analyze(frame)
+
+    assert len(calls) == 1
@@ -0,0 +1,54 @@
+from ocr_pool import OcrPool
+from order_number import DEFAULT_STAGES, OrderNumberExtractor
+
+
+class FakeEngine:
+    """Reads the header as given for the configs in readable, and nothing otherwise"""
+
+    name = 'fake'
+
+    def __init__(self, readable):
+        self.readable = readable
+        self.configs = []
+
+    def image_to_data(self, image, config=''):
+        self.configs.append(config)
+        if config in self.readable:
+            return {'text': ['Order', '#123456789'], 'conf': [95, 96]}
+        return {'text': [''], 'conf': [-1]}
+
+
+def config_of(stage_name):
+    return dict(DEFAULT_STAGES)[stage_name]
+
+
+def test_first_stage_resolves_with_one_call():
+    engine = FakeEngine({config_of('block_plain')})
+    extractor = OrderNumberExtractor(engine)
+
+    best = extractor.extract(image=None)
+
+    assert best['number'] == '123456789'
+    assert best['stage'] == 'block_plain'
+    assert best['calls'] == 1
+    assert engine.configs == [config_of('block_plain')]
+
+
+def test_every_stage_that_ran_is_counted():
+    engine = FakeEngine({config_of('word_digits')})
+    extractor = OrderNumberExtractor(engine, pool=OcrPool(workers=1, engine=engine))
+
+    best = extractor.extract(image=None)
+
+    assert best['stage'] == 'word_digits'
+    assert best['calls'] == len(DEFAULT_STAGES) == len(engine.configs)
+    assert extractor.stats()['stage_calls'] == {name: 1 for name, _ in DEFAULT_STAGES}
+
+
+def test_unresolved_header_costs_all_stages():
+    engine = FakeEngine(set())
+    extractor = OrderNumberExtractor(engine)
+
+    assert extractor.extract(image=None) is None
+    assert extractor.stats()['mean_calls'] == len(DEFAULT_STAGES)
+    assert extractor.stats()['resolved_by'] == {'unresolved': 1}
@@ -0,0 +1,60 @@
+import io
+import re
+import zipfile
+
+import openpyxl
+
+from app import read_trade_report
+
+HEADERS = ['Time', 'Position', 'Symbol', 'Type', 'Volume', 'Price', 'S / L', 'T / P', 'Time', 'Price',
+           'Commission', 'Swap', 'Profit']
+
+
+def make_report(trades):
+    """An MT5 history export: trader info in rows 2-3, headers in row 7, trades below"""
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.cell(2, 4, 'Jane Trader')
+    worksheet.cell(3, 4, '12345678')
+    for col, header in enumerate(HEADERS, start=1):
+        worksheet.cell(7, col, header)
+    for i in range(trades):
+        worksheet.cell(8 + i, 1, f'2024.01.01 00:{i:02d}:00')
+        worksheet.cell(8 + i, 2, 10_000_000 + i)
+        worksheet.cell(8 + i, 13, (i + 1.5) * (-1) ** i)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def with_dimension(content, ref):
+    """Rewrite the first sheet's stored <dimension> tag, as some exporters leave it stale"""
+    source = zipfile.ZipFile(io.BytesIO(content))
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w') as target:
+        for item in source.infolist():
+            data = source.read(item.filename)
+            if item.filename == 'xl/worksheets/sheet1.xml':
+                data, count = re.subn(rb'<dimension ref="[^"]*"\s*/>', f'<dimension ref="{ref}"/>'.encode(), data)
+                assert count == 1
+            target.writestr(item, data)
+    return output.getvalue()
+
+
+def test_reads_trader_info_and_trade_columns():
+    trader_info, columns = read_trade_report(io.BytesIO(make_report(30)))
+
+    assert trader_info == {'name': 'Jane Trader', 'account': '12345678'}
+    assert columns['original_index'] == list(range(30))
+    assert columns['position'] == [10_000_000 + i for i in range(30)]
+    assert columns['time'][0] == '2024.01.01 00:00:00'
+    assert columns['profit'][:2] == [1.5, -2.5]
+
+
+def test_stale_dimension_tag_does_not_truncate_trades():
+    content = with_dimension(make_report(30), 'A1:M10')
+
+    _, columns = read_trade_report(io.BytesIO(content))
+
+    assert len(columns['profit']) == 30
+    assert columns['position'][-1] == 10_000_029
@@ -0,0 +1,78 @@
+from order_ocr import ROW_HEIGHT
+from scroll_model import ScrollModel, SweepIndex, frame_rows, jump_keys
+
+
+class Frame:
+    """The parts of a FrameAnalysis the scroll model reads: one word per row, top to bottom"""
+
+    def __init__(self, order_ids, first_row=0):
+        self.words = [{'top': (first_row + row) * ROW_HEIGHT, 'height': 14, 'order_ids': [str(order)]}
+                      for row, order in enumerate(order_ids)]
+
+
+def test_jump_keys_overshoot_by_half_a_view():
+    assert jump_keys(-5, 30) == [('up', 20)]
+    assert jump_keys(50, 30) == [('pagedown', 2), ('down', 5)]
+    assert jump_keys(-500, 30, max_moves=30) == [('pageup', 1)]
+
+
+def test_frame_rows_place_ids_by_row():
+    assert frame_rows(Frame([7, 8, 9], first_row=2)) == [(2, '7'), (3, '8'), (4, '9')]
+
+
+def test_plan_estimates_rows_from_ids_per_row():
+    model = ScrollModel(visible_rows=30)
+    model.observe(Frame(range(1000, 1300, 10)))  # 10 ids per row
+
+    plan = model.plan(['800', '1200'])
+
+    assert model.ids_per_row == 10
+    assert plan['target'] == '800'
+    assert plan['rows'] == -20
+    assert plan['keys'] == [('pageup', 1)]  # 35 moves capped at one page
+
+
+def test_targets_in_seen_ranges_or_past_list_ends_are_unreachable():
+    model = ScrollModel(visible_rows=30)
+    model.observe(Frame(range(1000, 1300, 10)))
+    assert model.plan(['1105']) is None  # Passed over by the frame, so not in the list
+
+    plan = model.plan(['900'])
+    model.record(plan)
+    model.observe(Frame(range(1000, 1300, 10)))  # The jump didn't move the view: top of the list
+
+    assert model.first_id == 1000
+    assert not model.reachable(900)
+    assert model.plan(['900']) is None
+
+
+def test_target_is_given_up_after_max_jumps():
+    model = ScrollModel(visible_rows=30, max_jumps=3)
+    for top in (5000, 4000, 3000):
+        model.observe(Frame(range(top, top + 300, 10)))
+        model.record(model.plan(['100']))
+
+    assert 100 in model.unreachable
+    assert model.plan(['100']) is None
+
+
+def test_sweep_index_places_overlapping_and_adjacent_pages():
+    index = SweepIndex()
+    assert index.add_frame(Frame([10, 11, 12, 13])) == 4
+    assert index.add_frame(Frame([12, 13, 14, 15])) == 2   # Overlaps by two rows
+    assert index.add_frame(Frame([16, 17])) == 2           # No overlap: follows the last row
+
+    assert index.order_ids() == [str(order) for order in range(10, 18)]
+    assert [index.row_now(order) for order in ('10', '15', '17')] == [0, 5, 7]
+
+
+def test_sweep_index_rows_shift_up_after_remove():
+    index = SweepIndex()
+    index.add_frame(Frame(range(100, 110)))
+
+    index.remove('103')
+    index.remove('106')
+
+    assert [index.row_now(order) for order in ('102', '104', '105', '107', '109')] == [2, 3, 4, 5, 7]
+    assert index.anchor(Frame([104, 105, 107], first_row=0)) == 3
+    assert len(index) == 8
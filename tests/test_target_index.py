@@ -0,0 +1,78 @@
+from target_index import TargetIndex, fits_sequence, within_one_edit
+
+
+def test_exact_and_one_edit_reads_match():
+    index = TargetIndex(['170400008', '162318649'])
+
+    assert index.match('#170400008') == ('170400008', 'exact')
+    assert index.match('17040000') == ('170400008', 'fuzzy')     # Dropped digit
+    assert index.match('7162318649') == ('162318649', 'fuzzy')   # Extra digit
+    assert index.match('162318640') == ('162318649', 'fuzzy')    # Misread digit
+    assert index.match('162381649') is None                      # Swapped digits are two edits
+
+
+def test_read_near_two_targets_is_ambiguous():
+    index = TargetIndex(['100000145', '100000147'])
+
+    assert index.match('100000146') is None
+    assert index.stats()['ambiguous_reads'] == 1
+
+
+def test_removed_target_no_longer_matches():
+    index = TargetIndex(['100000155'])
+    index.remove('100000155')
+
+    assert index.match('100000155') is None
+    assert index.match('10000155') is None
+    assert len(index) == 0 and not index.keys
+
+
+def test_in_sequence_neighbour_does_not_stand_in_for_target():
+    index = TargetIndex(['100000155'])
+
+    # 100000155 isn't in the list; every read here is a real neighbour one edit away
+    matches = index.match_frame(['100000153', '100000154', '100000156', '100000157'])
+
+    assert matches == {}
+    assert index.stats()['in_sequence_reads'] == 4
+
+
+def test_out_of_sequence_misread_still_matches():
+    index = TargetIndex(['100000155'])
+
+    matches = index.match_frame(['100000153', '100000154', '10000155', '100000156'])
+
+    assert matches == {'100000155': '10000155'}
+
+
+def test_exact_read_wins_over_near_miss():
+    index = TargetIndex(['100000155'])
+
+    matches = index.match_frame(['100000199', '100000155', '100000150'])
+
+    assert matches == {'100000155': '100000155'}
+    assert index.stats()['fuzzy_matches'] == 0
+
+
+def test_rejected_read_is_not_matched_again():
+    index = TargetIndex(['100000155'])
+    index.reject('10000155')
+
+    assert index.match('10000155') is None
+    assert index.match('100000155') == ('100000155', 'exact')
+
+
+def test_within_one_edit():
+    assert within_one_edit('12345', '12345')
+    assert within_one_edit('12345', '1245')
+    assert within_one_edit('12345', '12945')
+    assert not within_one_edit('12345', '21345')
+    assert not within_one_edit('12345', '123')
+
+
+def test_fits_sequence_in_either_direction():
+    assert fits_sequence(['10', '11', '12'], 1)
+    assert fits_sequence(['12', '11', '10'], 1)
+    assert not fits_sequence(['10', '1', '12'], 1)
+    assert not fits_sequence(['10', '12', '12'], 1)
+    assert fits_sequence(['11'], 0)
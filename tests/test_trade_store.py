@@ -0,0 +1,76 @@
+import app as trade_app
+from trade_store import DiskTradeStore, MemoryTradeStore, ParsedUploadCache, StoredUpload
+from trade_table import TradeTable
+
+
+def make_upload(rows=5):
+    table = TradeTable.from_columns({
+        'original_index': list(range(rows)),
+        'position': [10_000_000 + i for i in range(rows)],
+        'time': [f'2024.01.01 00:0{i}:00' for i in range(rows)],
+        'profit': [1.0 if i % 2 else -1.0 for i in range(rows)]
+    })
+    return StoredUpload({'name': 'Jane'}, table)
+
+
+def use_store(monkeypatch, store, parsed_cache):
+    monkeypatch.setattr(trade_app, 'trade_store', store)
+    monkeypatch.setattr(trade_app, 'parsed_cache', parsed_cache)
+
+
+def current_upload_for(upload_id):
+    with trade_app.app.test_request_context():
+        trade_app.session['upload_id'] = upload_id
+        return trade_app.current_upload()
+
+
+def test_disk_store_records_one_miss_per_lookup(tmp_path, monkeypatch):
+    parsed_cache = ParsedUploadCache(str(tmp_path))
+    use_store(monkeypatch, DiskTradeStore(parsed_cache), parsed_cache)
+
+    upload = current_upload_for('not-uploaded')
+
+    assert len(upload.table) == 0
+    assert parsed_cache.stats()['misses'] == 1
+
+
+def test_memory_store_reloads_evicted_upload_from_parsed_cache(tmp_path, monkeypatch):
+    parsed_cache = ParsedUploadCache(str(tmp_path))
+    parsed_cache.save('evicted', make_upload())
+    store = MemoryTradeStore()
+    use_store(monkeypatch, store, parsed_cache)
+
+    upload = current_upload_for('evicted')
+
+    assert len(upload.table) == 5
+    assert store.get('evicted') is not None
+    assert (parsed_cache.hits, parsed_cache.misses) == (1, 0)
+
+
+def test_memory_store_evicts_least_recently_used():
+    upload = make_upload()
+    store = MemoryTradeStore(max_bytes=2 * upload.nbytes)
+    store.put('a', upload)
+    store.put('b', make_upload())
+    store.get('a')
+    store.put('c', make_upload())
+
+    assert store.get('b') is None
+    assert store.get('a') is not None and store.get('c') is not None
+    assert store.stats()['evictions'] == 1
+
+
+def test_api_trades_clamps_page_below_one(tmp_path, monkeypatch):
+    parsed_cache = ParsedUploadCache(str(tmp_path))
+    store = MemoryTradeStore()
+    store.put('upload', make_upload())
+    use_store(monkeypatch, store, parsed_cache)
+    client = trade_app.app.test_client()
+    with client.session_transaction() as session:
+        session['upload_id'] = 'upload'
+
+    response = client.get('/api/trades?page=-3&page_size=2').get_json()
+
+    assert response['page'] == 1
+    assert response['has_prev'] is False
+    assert [trade['position'] for trade in response['trades']] == ['10000000', '10000001']
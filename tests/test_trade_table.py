@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from benchmark import legacy_build_trades, make_trade_columns
+from trade_table import TradeTable, RunIndex, SortIndex
+
+FILTER_TYPES = ['all', 'consecutive', '1', '2', '3', '4', '5']
+
+
+def baseline_filter(trades, trade_type, filter_type):
+    """The list-of-dicts trade type and consecutive filtering app.py used before RunIndex"""
+    if trade_type == 'profit':
+        trades = [trade for trade in trades if trade['profit'] > 0]
+    elif trade_type == 'loss':
+        trades = [trade for trade in trades if trade['profit'] < 0]
+    if filter_type == 'all' or not trades:
+        return trades
+
+    groups = [[trades[0]]]
+    for previous, current in zip(trades, trades[1:]):
+        if current['original_index'] == previous['original_index'] + 1:
+            groups[-1].append(current)
+        else:
+            groups.append([current])
+
+    if filter_type == 'consecutive':
+        return [trade for group in groups if len(group) >= 2 for trade in group]
+    return [trade for group in groups for trade in group[:int(filter_type)]]
+
+
+def make_table(profits, positions=None):
+    rows = len(profits)
+    return TradeTable.from_columns({
+        'original_index': list(range(rows)),
+        'position': positions if positions is not None else [10_000_000 + i for i in range(rows)],
+        'time': [f'2024.01.01 00:00:{i:02d}' for i in range(rows)],
+        'profit': profits
+    })
+
+
+def test_descending_sort_keeps_ties_in_file_order():
+    table = make_table([5.0, -1.0, 5.0, 2.0, 5.0, -1.0])
+    sort_index = SortIndex.build(table)
+
+    ascending = sort_index.take('profit', False, np.arange(6))
+    descending = sort_index.take('profit', True, np.arange(6))
+
+    assert ascending.tolist() == [1, 5, 3, 0, 2, 4]
+    assert descending.tolist() == [0, 2, 4, 3, 1, 5]
+
+
+def test_missing_values_sort_last_in_both_directions():
+    table = make_table([1.0, 2.0, 3.0, 4.0], positions=[30, None, 10, 20])
+    sort_index = SortIndex.build(table)
+
+    assert sort_index.take('position', False, np.arange(4)).tolist() == [2, 3, 0, 1]
+    assert sort_index.take('position', True, np.arange(4)).tolist() == [0, 3, 2, 1]
+
+
+def test_ordered_filters_rows_in_sort_order():
+    table = make_table([3.0, 1.0, 3.0, 2.0])
+    sort_index = SortIndex.build(table)
+    member = np.array([True, False, True, True])
+
+    assert sort_index.ordered('profit', True, member).tolist() == [0, 2, 3]
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+@pytest.mark.parametrize('trade_type', ['all', 'profit', 'loss'])
+def test_run_index_matches_baseline_filter(seed, trade_type):
+    columns = make_trade_columns(400, seed=seed)  # Includes blank-profit rows that break runs
+    columns['profit'][::7] = [0.0] * len(columns['profit'][::7])  # Breakeven trades too
+    table = TradeTable.from_columns(columns)
+    run_index = RunIndex.build(table)
+    trades = legacy_build_trades(columns)
+
+    for filter_type in FILTER_TYPES:
+        expected = [trade['original_index'] for trade in baseline_filter(trades, trade_type, filter_type)]
+        selected = table.original_index[run_index.select(trade_type, filter_type)]
+        assert selected.tolist() == expected, filter_type
+
+
+def test_run_cap_keeps_the_start_of_every_run():
+    table = make_table([1.0, 2.0, 3.0, -1.0, 4.0, 5.0, -2.0, -3.0])
+    run_index = RunIndex.build(table)
+
+    assert run_index.select('profit', '2').tolist() == [0, 1, 4, 5]
+    assert run_index.select('loss', '1').tolist() == [3, 6]
+    assert run_index.select('loss', 'consecutive').tolist() == [6, 7]
+    assert run_index.select('all', 'consecutive').tolist() == list(range(8))
+    assert run_index.select('profit', 'bogus').tolist() == []
+
+
+def search(sort_index, table, prefix):
+    ranges = sort_index.position_prefix_ranges(prefix)
+    total = sum(stop - start for start, stop in ranges)
+    return table.position[sort_index.take_ranges(ranges, 0, total)].tolist()
+
+
+def test_position_prefix_ranges_span_decades():
+    positions = [49999, 5, 123, 5000, 51, 509, 12, 50, 500, 6, 5999]
+    table = make_table([1.0] * len(positions), positions=positions)
+    sort_index = SortIndex.build(table)
+
+    assert search(sort_index, table, '5') == [5, 50, 51, 500, 509, 5000, 5999]
+    assert search(sort_index, table, '50') == [50, 500, 509, 5000]
+    assert search(sort_index, table, '499') == [49999]
+    assert search(sort_index, table, '7') == []
+    assert search(sort_index, table, '05') == []
+
+
+def test_take_ranges_pages_across_range_boundaries():
+    positions = [5, 50, 51, 500, 509, 5000, 6]
+    table = make_table([1.0] * len(positions), positions=positions)
+    sort_index = SortIndex.build(table)
+    ranges = sort_index.position_prefix_ranges('5')
+
+    pages = [table.position[sort_index.take_ranges(ranges, start, start + 2)].tolist() for start in (0, 2, 4, 6)]
+
+    assert pages == [[5, 50], [51, 500], [509, 5000], []]
@@ -0,0 +1,205 @@
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+from trade_table import TradeTable, RunIndex, SortIndex
+
+
+class StoredUpload:
+    """One parsed report: trader info, the trade table and its run and sort indexes"""
+
+    def __init__(self, trader_info, table, run_index=None, sort_index=None):
+        self.trader_info = trader_info
+        self.table = table
+        self.run_index = run_index if run_index is not None else RunIndex.build(table)
+        self.sort_index = sort_index if sort_index is not None else SortIndex.build(table)
+
+    @classmethod
+    def empty(cls):
+        return cls({}, TradeTable.empty())
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes + self.run_index.nbytes + self.sort_index.nbytes
+
+
+class MemoryTradeStore:
+    """
+    In-process store of parsed uploads keyed by upload id.
+    Idle uploads are evicted least-recently-used first once max_bytes is exceeded.
+    """
+
+    reads_parsed_cache = False  # get() never looks in the parsed cache; callers fall back to it
+
+    def __init__(self, max_bytes=512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.uploads = OrderedDict()
+        self.total_bytes = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, upload_id):
+        if upload_id is None:
+            return None
+        with self.lock:
+            upload = self.uploads.get(upload_id)
+            if upload is not None:
+                self.uploads.move_to_end(upload_id)
+            return upload
+
+    def put(self, upload_id, upload):
+        with self.lock:
+            self._remember(upload_id, upload)
+
+    def delete(self, upload_id):
+        with self.lock:
+            upload = self.uploads.pop(upload_id, None)
+            if upload is not None:
+                self.total_bytes -= upload.nbytes
+
+    def _remember(self, upload_id, upload):
+        previous = self.uploads.pop(upload_id, None)
+        if previous is not None:
+            self.total_bytes -= previous.nbytes
+        self.uploads[upload_id] = upload
+        self.total_bytes += upload.nbytes
+
+        # Evict idle uploads, but always keep the one just stored
+        while self.total_bytes > self.max_bytes and len(self.uploads) > 1:
+            _, evicted = self.uploads.popitem(last=False)
+            self.total_bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def stats(self):
+        return {
+            'backend': type(self).__name__,
+            'uploads': len(self.uploads),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'evictions': self.evictions
+        }
+
+
+class ParsedUploadCache:
+    """
+    Persistent cache of parsed uploads keyed by the content hash of the uploaded file.
+    Each entry is a directory of .npy columns plus meta.json; the oldest entries are
+    evicted once the directory grows past max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes=2 * 1024 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self, upload_id, mmap_mode='r'):
+        """Load a cached upload, memory-mapped by default; None when it isn't cached"""
+        path = self._path(upload_id)
+        try:
+            table, trader_info = TradeTable.load(path, mmap_mode=mmap_mode)
+            os.utime(path)  # Mark as recently used for eviction
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return StoredUpload(trader_info, table)
+
+    def save(self, upload_id, upload):
+        path = self._path(upload_id)
+        if os.path.isdir(path):
+            os.utime(path)
+            return
+
+        # Write into a temporary directory first so readers never see a partial entry
+        tmp_path = tempfile.mkdtemp(dir=self.directory, prefix='.tmp-')
+        try:
+            upload.table.save(tmp_path, upload.trader_info)
+            os.replace(tmp_path, path)
+        except OSError:
+            shutil.rmtree(tmp_path, ignore_errors=True)  # Another worker stored it first
+        self.evict(keep=upload_id)
+
+    def evict(self, keep=None):
+        """Remove least-recently-used entries until the directory fits in max_bytes"""
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith('.') or not os.path.isdir(path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+            entries.append((os.path.getmtime(path), name, size))
+
+        total = sum(size for _, _, size in entries)
+        for _, name, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+            total -= size
+            self.evictions += 1
+        return total
+
+    def _path(self, upload_id):
+        return os.path.join(self.directory, upload_id)
+
+    def stats(self):
+        return {
+            'directory': self.directory,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+
+class DiskTradeStore(MemoryTradeStore):
+    """
+    Store backed by a ParsedUploadCache directory, so several server workers see the
+    same parsed data through memory-mapped column files. Each worker keeps its own
+    in-memory LRU in front of the directory.
+    """
+
+    reads_parsed_cache = True   # get() falls back to the directory itself
+
+    def __init__(self, parsed_cache, max_bytes=512 * 1024 * 1024):
+        super().__init__(max_bytes)
+        self.parsed_cache = parsed_cache
+
+    def get(self, upload_id):
+        upload = super().get(upload_id)
+        if upload is not None or upload_id is None:
+            return upload
+
+        # Another worker may have stored it
+        upload = self.parsed_cache.load(upload_id)
+        if upload is not None:
+            with self.lock:
+                self._remember(upload_id, upload)
+        return upload
+
+    def put(self, upload_id, upload):
+        self.parsed_cache.save(upload_id, upload)
+        super().put(upload_id, upload)
+
+    def stats(self):
+        stats = super().stats()
+        stats['parsed_cache'] = self.parsed_cache.stats()
+        return stats
+
+
+def create_trade_store(config, parsed_cache):
+    """Build the trade store selected by TRADE_STORE_BACKEND ('memory' or 'disk')"""
+    backend = config.get('TRADE_STORE_BACKEND', 'memory')
+    max_bytes = config.get('TRADE_STORE_MAX_BYTES', 512 * 1024 * 1024)
+
+    if backend == 'memory':
+        return MemoryTradeStore(max_bytes)
+    if backend == 'disk':
+        return DiskTradeStore(parsed_cache, max_bytes)
+    raise ValueError(f"Unknown TRADE_STORE_BACKEND: {backend}")
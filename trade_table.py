@@ -0,0 +1,330 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Trade type codes are the sign of the profit
+PROFIT = 1
+LOSS = -1
+BREAKEVEN = 0
+TYPE_NAMES = {PROFIT: 'PROFIT', LOSS: 'LOSS', BREAKEVEN: 'BREAKEVEN'}
+
+COLUMNS = ('profit', 'original_index', 'position', 'position_valid', 'time', 'type_code')
+
+MT5_TIME_FORMAT = '%Y.%m.%d %H:%M:%S'
+EXCEL_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class TradeTable:
+    """Columnar, array-backed store of all trades from one uploaded report"""
+
+    def __init__(self, profit, original_index, position, position_valid, time, type_code, time_format=MT5_TIME_FORMAT):
+        self.profit = profit                  # float64
+        self.original_index = original_index  # int64, row index under the report header
+        self.position = position              # int64, only meaningful where position_valid
+        self.position_valid = position_valid  # bool null mask for position
+        self.time = time                      # datetime64[s], NaT when missing
+        self.type_code = type_code            # int8, PROFIT / LOSS / BREAKEVEN
+        self.time_format = time_format        # How the report wrote its times, used for display
+
+    @classmethod
+    def empty(cls):
+        return cls(
+            np.empty(0, dtype=np.float64),
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=bool),
+            np.empty(0, dtype='datetime64[s]'),
+            np.empty(0, dtype=np.int8)
+        )
+
+    @classmethod
+    def from_columns(cls, trade_columns):
+        """
+        Build the table from the raw report columns with whole-column operations.
+        Rows without a numeric profit are dropped.
+        """
+        profit = pd.to_numeric(pd.Series(trade_columns['profit'], dtype=object), errors='coerce')
+        valid = profit.notna().to_numpy()
+        profit = profit.to_numpy(dtype=np.float64)[valid]
+
+        original_index = np.asarray(trade_columns['original_index'], dtype=np.int64)[valid]
+
+        # Positions are order ids; anything that isn't a whole number is treated as missing
+        position = pd.to_numeric(pd.Series(trade_columns['position'], dtype=object)[valid], errors='coerce')
+        position = position.to_numpy(dtype=np.float64)
+        position_valid = np.isfinite(position) & (np.mod(position, 1) == 0)
+        position = np.where(position_valid, position, 0).astype(np.int64)
+
+        time, time_format = parse_times(pd.Series(trade_columns['time'], dtype=object)[valid])
+
+        return cls(profit, original_index, position, position_valid, time, np.sign(profit).astype(np.int8), time_format)
+
+    @classmethod
+    def load(cls, directory, mmap_mode=None):
+        """
+        Load a table written by save. With mmap_mode='r' the columns are memory-mapped,
+        so every process reading the same directory shares one copy in the page cache.
+        """
+        with open(os.path.join(directory, 'meta.json')) as meta_file:
+            meta = json.load(meta_file)
+        columns = [np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode) for name in COLUMNS]
+        return cls(*columns, time_format=meta['time_format']), meta.get('trader_info', {})
+
+    def save(self, directory, trader_info=None):
+        """Write every column as a .npy file plus a meta.json into directory"""
+        os.makedirs(directory, exist_ok=True)
+        for name in COLUMNS:
+            np.save(os.path.join(directory, f'{name}.npy'), getattr(self, name))
+        with open(os.path.join(directory, 'meta.json'), 'w') as meta_file:
+            json.dump({'time_format': self.time_format, 'trader_info': trader_info or {}}, meta_file)
+
+    def __len__(self):
+        return len(self.profit)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in COLUMNS)
+
+    def rows(self, indices):
+        """Materialize the given rows as dicts for the templates"""
+        indices = np.asarray(indices, dtype=np.int64)
+        position_valid = self.position_valid[indices]
+        positions = np.where(position_valid, self.position[indices].astype(str), 'N/A')
+        times = format_times(self.time[indices], self.time_format)
+
+        return [
+            {
+                'position': position,
+                'time': time,
+                'profit': profit,
+                'type': TYPE_NAMES[type_code],
+                'original_index': original_index
+            }
+            for position, time, profit, type_code, original_index in zip(
+                positions.tolist(),
+                times,
+                self.profit[indices].tolist(),
+                self.type_code[indices].tolist(),
+                self.original_index[indices].tolist()
+            )
+        ]
+
+    def position_values(self, indices):
+        """Numeric position values of the given rows, skipping missing positions"""
+        indices = np.asarray(indices, dtype=np.int64)
+        return self.position[indices][self.position_valid[indices]].tolist()
+
+
+def parse_times(times):
+    """Parse the Time column into datetime64[s], remembering the format used for display"""
+    present = times[times.notna()]
+    first_string = next((value for value in present if isinstance(value, str)), '')
+
+    # MT5 writes times as '2024.01.02 10:00:00' text; Excel date cells come back as datetimes
+    time_format = MT5_TIME_FORMAT if '.' in first_string else EXCEL_TIME_FORMAT
+
+    parsed = np.full(len(times), np.datetime64('NaT'), dtype='datetime64[s]')
+    if len(present):
+        text = present.astype(str)
+        values = pd.to_datetime(text, format=time_format, errors='coerce')
+        # Fall back to the slower mixed-format parser only for the leftovers
+        leftover = values.isna().to_numpy()
+        if leftover.any():
+            values[leftover] = pd.to_datetime(text[leftover], format='mixed', errors='coerce')
+        parsed[times.notna().to_numpy()] = values.to_numpy(dtype='datetime64[s]')
+    return parsed, time_format
+
+
+def format_times(times, time_format):
+    """Render datetime64 values the way the report wrote them, 'N/A' for missing times"""
+    formatted = pd.Series(times).dt.strftime(time_format)
+    return formatted.where(formatted.notna(), 'N/A').tolist()
+
+
+class RunIndex:
+    """
+    Consecutive-run labels for every trade, built once per upload.
+    For each run definition (profit, loss and mixed 'all') every member trade records
+    its run id, its position within the run and the run length.
+    """
+
+    def __init__(self, members, runs):
+        self.members = members  # trade_type -> bool mask of the trades the definition covers
+        self.runs = runs        # trade_type -> (run_id, position_in_run, run_length), int32, -1 for non-members
+
+    @classmethod
+    def build(cls, table):
+        members = {
+            'profit': table.type_code == PROFIT,
+            'loss': table.type_code == LOSS,
+            'all': np.ones(len(table), dtype=bool)
+        }
+        runs = {}
+
+        for trade_type, member in members.items():
+            trades = np.flatnonzero(member)
+            labels = find_consecutive_runs(table, trades, trade_type)
+
+            # Scatter the labels back onto the full table
+            full_labels = []
+            for label in labels:
+                full = np.full(len(table), -1, dtype=np.int32)
+                full[trades] = label
+                full_labels.append(full)
+            runs[trade_type] = tuple(full_labels)
+
+        return cls(members, runs)
+
+    @property
+    def nbytes(self):
+        return sum(mask.nbytes for mask in self.members.values()) + sum(
+            label.nbytes for labels in self.runs.values() for label in labels
+        )
+
+    def count(self, trade_type):
+        """Number of trades the trade_type selects before consecutive filtering"""
+        return int(np.count_nonzero(self.members.get(trade_type, self.members['all'])))
+
+    def select(self, trade_type, filter_type):
+        """Row indices for a trade_type / filter_type combination, as a mask lookup"""
+        if trade_type not in self.members:
+            trade_type = 'all'
+        member = self.members[trade_type]
+        _, position_in_run, run_length = self.runs[trade_type]
+
+        if filter_type == 'all':
+            mask = member
+        elif filter_type == 'consecutive':
+            # Only trades that are part of consecutive sequences (2+ trades)
+            mask = run_length >= 2
+        elif filter_type.isdigit() and int(filter_type) >= 1:
+            # Up to N trades from the start of every run, single trades included
+            mask = member & (position_in_run < int(filter_type))
+        else:
+            return np.empty(0, dtype=np.int64)
+
+        return np.flatnonzero(mask)
+
+
+def find_consecutive_runs(table, trades, trade_type):
+    """
+    Find runs of consecutive trades of the same type in one vectorized pass.
+    trades are row indices in file order; returns the run id, position within the run
+    and run length of every trade.
+    """
+    original_index = table.original_index[trades]
+
+    # A new run starts wherever the original index jumps, or the profit sign flips for profit/loss runs
+    run_starts = np.ones(len(trades), dtype=bool)
+    run_starts[1:] = np.diff(original_index) != 1
+    if trade_type in ('profit', 'loss'):
+        sign = table.type_code[trades]
+        run_starts[1:] |= sign[1:] != sign[:-1]
+
+    run_id = np.cumsum(run_starts) - 1
+    start_positions = np.flatnonzero(run_starts)
+    position_in_run = np.arange(len(trades)) - start_positions[run_id]
+    run_length = np.diff(np.append(start_positions, len(trades)))[run_id]
+
+    return run_id, position_in_run, run_length
+
+
+class SortIndex:
+    """
+    Argsort orders of the sortable columns in both directions, built once per upload,
+    plus the sorted position array used for position-prefix search. Both directions are
+    stable, so tied rows keep their file order, and rows with a missing value sort last.
+    """
+
+    KEYS = ('profit', 'time', 'position')
+
+    def __init__(self, orders, descending_orders, valid_counts):
+        self.orders = orders              # key -> int32/int64 row indices in ascending key order
+        self.descending_orders = descending_orders  # key -> the same rows in descending key order
+        self.valid_counts = valid_counts  # key -> number of rows with a value for the key
+        self.sorted_position = None
+
+    @classmethod
+    def build(cls, table):
+        index_dtype = np.int32 if len(table) < np.iinfo(np.int32).max else np.int64
+        orders = {}
+        descending_orders = {}
+        valid_counts = {}
+
+        columns = {
+            'profit': (table.profit, np.ones(len(table), dtype=bool)),
+            'time': (table.time, ~np.isnat(table.time)),
+            'position': (table.position, table.position_valid)
+        }
+        for key, (values, valid) in columns.items():
+            # Stable sort of the rows that have a value, missing values appended in file order
+            present = np.flatnonzero(valid)
+            missing = np.flatnonzero(~valid)
+            order = present[np.argsort(values[present], kind='stable')]
+            # Stable ascending sort of the reversed rows, read backwards: descending, ties in file order
+            descending = present[::-1][np.argsort(values[present][::-1], kind='stable')][::-1]
+            orders[key] = np.concatenate([order, missing]).astype(index_dtype)
+            descending_orders[key] = np.concatenate([descending, missing]).astype(index_dtype)
+            valid_counts[key] = len(present)
+
+        sort_index = cls(orders, descending_orders, valid_counts)
+        sort_index.sorted_position = table.position[orders['position'][:valid_counts['position']]]
+        return sort_index
+
+    @property
+    def nbytes(self):
+        orders = list(self.orders.values()) + list(self.descending_orders.values())
+        return sum(order.nbytes for order in orders) + self.sorted_position.nbytes
+
+    def take(self, key, descending, view_positions):
+        """Row indices at the given positions of the key's sort order, in O(len(view_positions))"""
+        order = self.descending_orders[key] if descending else self.orders[key]
+        return order[np.asarray(view_positions, dtype=np.int64)].astype(np.int64)
+
+    def ordered(self, key, descending, member):
+        """All rows selected by the bool mask member, in the key's sort order"""
+        order = self.take(key, descending, np.arange(len(self.orders[key])))
+        return order[member[order]]
+
+    def position_prefix_ranges(self, prefix):
+        """
+        (start, stop) ranges into the position sort order for positions whose decimal
+        form starts with prefix, found by binary search over the sorted positions.
+        """
+        if not prefix.isdigit() or not len(self.sorted_position):
+            return []
+        if prefix.startswith('0'):
+            bounds = [(0, 1)] if prefix == '0' else []
+        else:
+            value = int(prefix)
+            largest = int(self.sorted_position[-1])
+            bounds = []
+            scale = 1
+            # Every longer number with this prefix lies in [value, value + 1) * 10^k
+            while value * scale <= largest:
+                bounds.append((value * scale, (value + 1) * scale))
+                scale *= 10
+
+        ranges = []
+        for low, high in bounds:
+            start = int(np.searchsorted(self.sorted_position, low, side='left'))
+            stop = int(np.searchsorted(self.sorted_position, min(high, np.iinfo(np.int64).max), side='left'))
+            if stop > start:
+                ranges.append((start, stop))
+        return ranges
+
+    def take_ranges(self, ranges, start, end):
+        """Row indices for positions start:end of the concatenated search ranges"""
+        order = self.orders['position']
+        pieces = []
+        offset = 0
+        for range_start, range_stop in ranges:
+            size = range_stop - range_start
+            if offset + size > start and offset < end:
+                low = range_start + max(start - offset, 0)
+                high = range_start + min(end - offset, size)
+                pieces.append(order[low:high])
+            offset += size
+        return np.concatenate(pieces).astype(np.int64) if pieces else np.empty(0, dtype=np.int64)
@@ -0,0 +1,100 @@
+import hashlib
+from collections import defaultdict
+
+import numpy as np
+
+
+class LatencyRecorder:
+    """Per-step latency histograms for the UI waits"""
+
+    BUCKETS_MS = (50, 100, 250, 500, 1000, 2000, 5000)
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.timeouts = defaultdict(int)
+
+    def record(self, step, seconds, timed_out=False):
+        self.samples[step].append(seconds)
+        if timed_out:
+            self.timeouts[step] += 1
+
+    def summary(self):
+        summary = {}
+        for step, samples in self.samples.items():
+            values = np.array(samples) * 1000
+            counts = np.histogram(values, bins=(0,) + self.BUCKETS_MS + (np.inf,))[0]
+            labels = [f"<{bucket}ms" for bucket in self.BUCKETS_MS] + [f">={self.BUCKETS_MS[-1]}ms"]
+            summary[step] = {
+                'count': len(samples),
+                'timeouts': self.timeouts[step],
+                'total_s': round(float(values.sum()) / 1000, 3),
+                'mean_ms': round(float(values.mean()), 1),
+                'p50_ms': round(float(np.percentile(values, 50)), 1),
+                'p95_ms': round(float(np.percentile(values, 95)), 1),
+                'max_ms': round(float(values.max()), 1),
+                'histogram': dict(zip(labels, counts.tolist()))
+            }
+        return summary
+
+
+class UiWaiter:
+    """
+    Waits for the terminal to be ready by polling small screen regions instead of
+    sleeping for a fixed time. A region's state is a hash of its pixels; waits end as
+    soon as the expected change (or stillness) is seen, or at the timeout.
+    """
+
+    def __init__(self, backend, recorder=None, poll_interval=0.05):
+        self.backend = backend
+        self.recorder = recorder if recorder is not None else LatencyRecorder()
+        self.poll_interval = poll_interval
+        self.last = None  # (region, image) of the latest poll
+
+    def snapshot(self, region):
+        """Hash of the pixels in region (left, top, width, height); None for the whole screen"""
+        image = self.backend.screenshot(region=region)
+        self.last = (region, image)
+        pixels = np.asarray(image)
+        return hashlib.blake2b(np.ascontiguousarray(pixels[::2, ::2]).tobytes(), digest_size=16).digest()
+
+    def last_image(self, region):
+        """The image the latest poll grabbed, if it was of region; a settled wait leaves the settled view here"""
+        if self.last is not None and self.last[0] == region:
+            return self.last[1]
+        return None
+
+    def wait_for_change(self, step, region, before, timeout, settle=True):
+        """
+        Wait until region no longer matches the before snapshot and, with settle, until it
+        stops changing. Returns False if the timeout ran out first.
+        """
+        start = self.backend.now()
+        deadline = start + timeout
+        current = self.snapshot(region)
+
+        while current == before and self.backend.now() < deadline:
+            self.backend.sleep(self.poll_interval)
+            current = self.snapshot(region)
+
+        changed = current != before
+        if changed and settle:
+            self._settle(region, current, deadline)
+
+        self.recorder.record(step, self.backend.now() - start, timed_out=not changed)
+        return changed
+
+    def wait_for_stable(self, step, region, timeout):
+        """Wait until two polls of region in a row look the same"""
+        start = self.backend.now()
+        stable = self._settle(region, self.snapshot(region), start + timeout)
+        self.recorder.record(step, self.backend.now() - start, timed_out=not stable)
+        return stable
+
+    def _settle(self, region, current, deadline):
+        while self.backend.now() < deadline:
+            self.backend.sleep(self.poll_interval)
+            latest = self.snapshot(region)
+            if latest == current:
+                return True
+            current = latest
+        return False